@@ -0,0 +1,70 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from collections.abc import Sequence
+
+STATEMENTS = {
+    "package": "import fastapi_inject",
+    "container": "from fastapi_inject import Container, Lazy, Memo, override",
+    "inject": "from fastapi_inject import Depends, enable_injection, inject",
+    "fastapi": "import fastapi",
+}
+# Only the light import paths have a budget, as the others are bound by FastAPI
+BUDGETS_MS = {"package": 50.0, "container": 100.0}
+
+
+def measure(statement: str, repeat: int) -> float:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    timings = [
+        float(
+            subprocess.run(  # noqa: S603
+                [sys.executable, "-c", code],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout,
+        )
+        for _ in range(repeat)
+    ]
+    return statistics.median(timings) * 1e3
+
+
+def run(repeat: int) -> dict[str, float]:
+    return {
+        name: round(measure(statement, repeat), 3)
+        for name, statement in STATEMENTS.items()
+    }
+
+
+def check(results: dict[str, float]) -> list[str]:
+    return [
+        f"{name}: {results[name]:.1f}ms exceeds the {budget:.0f}ms budget"
+        for name, budget in BUDGETS_MS.items()
+        if results[name] > budget
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure import time of the package in fresh interpreters.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    for name, duration in results.items():
+        sys.stdout.write(f"{name:<12} {duration:>10.1f}ms\n")
+    errors = check(results)
+    if errors:
+        sys.stderr.write("\n".join(errors) + "\n")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Literal
+
+import anyio
+import anyio.to_thread
+import fastapi
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.resolution import MIXES, Mix, Scenario, _get_commit, build_graph
+from fastapi_inject import enable_injection, inject
+
+Wiring = Literal["native", "inject"]
+
+WIRINGS: tuple[Wiring, ...] = ("native", "inject")
+SCENARIO_ENV = "FASTAPI_INJECT_LOAD_SCENARIO"
+
+
+@dataclass(frozen=True)
+class LoadScenario:
+    depth: int
+    width: int
+    mix: Mix
+    wiring: Wiring
+
+    @property
+    def name(self) -> str:
+        return f"{self.mix}-d{self.depth}-w{self.width}-{self.wiring}"
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    scenario: str
+    wiring: Wiring
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    threadpool_peak: int | None
+    threadpool_limit: int | None
+    peak_rss_kb: int | None
+
+
+def build_app(scenario: LoadScenario) -> FastAPI:
+    app = FastAPI()
+    graph = Scenario(scenario.depth, scenario.width, scenario.mix)
+    target = build_graph(graph, app)
+    if scenario.wiring == "native":
+        app.get("/")(target)
+        return app
+
+    injected = inject(target)
+    if graph.is_async:
+
+        async def endpoint() -> Any:  # noqa: ANN401
+            return await injected()
+
+    else:
+
+        def endpoint() -> Any:  # type: ignore[misc] # noqa: ANN401
+            return injected()
+
+    app.get("/")(endpoint)
+    enable_injection(app)
+    return app
+
+
+def create_app() -> FastAPI:
+    # Entry point for uvicorn --factory, configured through the environment
+    return build_app(LoadScenario(**json.loads(os.environ[SCENARIO_ENV])))
+
+
+def _percentile_ms(latencies: Sequence[float], percentile: int) -> float:
+    if len(latencies) < 2:  # noqa: PLR2004
+        return latencies[0] * 1e3 if latencies else 0.0
+    return statistics.quantiles(latencies, n=100)[percentile - 1] * 1e3
+
+
+def _get_peak_rss_kb(pid: int | None = None) -> int | None:
+    if pid is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak // 1024 if sys.platform == "darwin" else peak
+    try:
+        with open(f"/proc/{pid}/status") as file:  # noqa: PTH123
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class _ThreadpoolSampler:
+    __slots__ = ("limiter", "peak")
+
+    def __init__(self) -> None:
+        self.limiter = anyio.to_thread.current_default_thread_limiter()
+        self.peak = 0
+
+    async def run(self) -> None:
+        while True:
+            self.peak = max(self.peak, self.limiter.borrowed_tokens)
+            await anyio.sleep(0.001)
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    requests: int,
+) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.get("/")
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != httpx.codes.OK:
+                errors += 1
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(concurrency):
+            tg.start_soon(worker)
+    return latencies, errors
+
+
+def _make_result(  # noqa: PLR0913
+    scenario: LoadScenario,
+    concurrency: int,
+    latencies: list[float],
+    errors: int,
+    duration: float,
+    *,
+    threadpool_peak: int | None,
+    threadpool_limit: int | None,
+    peak_rss_kb: int | None,
+) -> LoadResult:
+    requests = len(latencies) + errors
+    return LoadResult(
+        scenario.name,
+        scenario.wiring,
+        concurrency,
+        requests,
+        errors,
+        round(duration, 3),
+        round(requests / duration, 1) if duration else 0.0,
+        round(_percentile_ms(latencies, 50), 3),
+        round(_percentile_ms(latencies, 99), 3),
+        threadpool_peak,
+        threadpool_limit,
+        peak_rss_kb,
+    )
+
+
+async def run_in_process(
+    scenario: LoadScenario,
+    concurrency: int,
+    requests: int,
+    warmup: int = 0,
+) -> LoadResult:
+    app = build_app(scenario)
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://load") as client,
+    ):
+        await _drive(client, concurrency, warmup)
+        sampler = _ThreadpoolSampler()
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(sampler.run)
+            start = time.perf_counter()
+            latencies, errors = await _drive(client, concurrency, requests)
+            duration = time.perf_counter() - start
+            tg.cancel_scope.cancel()
+    return _make_result(
+        scenario,
+        concurrency,
+        latencies,
+        errors,
+        duration,
+        threadpool_peak=sampler.peak,
+        threadpool_limit=int(sampler.limiter.total_tokens),
+        peak_rss_kb=_get_peak_rss_kb(),
+    )
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def _serve(scenario: LoadScenario) -> Iterator[tuple[str, int]]:
+    port = _get_free_port()
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "benchmarks.load:create_app",
+            "--factory",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, SCENARIO_ENV: json.dumps(asdict(scenario))},
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                httpx.get(url)
+                break
+            except httpx.TransportError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        yield url, process.pid
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_uvicorn(
+    scenario: LoadScenario,
+    concurrency: int,
+    requests: int,
+    warmup: int = 0,
+) -> LoadResult:
+    async def drive(url: str) -> tuple[list[float], int, float]:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+            await _drive(client, concurrency, warmup)
+            start = time.perf_counter()
+            latencies, errors = await _drive(client, concurrency, requests)
+            return latencies, errors, time.perf_counter() - start
+
+    with _serve(scenario) as (url, pid):
+        latencies, errors, duration = anyio.run(drive, url)
+        peak_rss_kb = _get_peak_rss_kb(pid)
+    # The server's threadpool lives in another process, so it isn't sampled
+    return _make_result(
+        scenario,
+        concurrency,
+        latencies,
+        errors,
+        duration,
+        threadpool_peak=None,
+        threadpool_limit=None,
+        peak_rss_kb=peak_rss_kb,
+    )
+
+
+def run(
+    scenarios: Sequence[LoadScenario],
+    concurrencies: Sequence[int],
+    requests: int,
+    warmup: int,
+    *,
+    uvicorn: bool = False,
+) -> dict[str, Any]:
+    results = []
+    for scenario in scenarios:
+        for concurrency in concurrencies:
+            if uvicorn:
+                result = run_uvicorn(scenario, concurrency, requests, warmup)
+            else:
+                result = anyio.run(
+                    run_in_process,
+                    scenario,
+                    concurrency,
+                    requests,
+                    warmup,
+                )
+            results.append(result)
+    return {
+        "meta": {
+            "commit": _get_commit(),
+            "python": platform.python_version(),
+            "fastapi": fastapi.__version__,
+            "server": "uvicorn" if uvicorn else "asgi",
+            "requests": requests,
+            "warmup": warmup,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _format(result: dict[str, Any]) -> str:
+    threadpool = (
+        "-"
+        if result["threadpool_peak"] is None
+        else f"{result['threadpool_peak']}/{result['threadpool_limit']}"
+    )
+    return (
+        f"{result['scenario']:<30} c={result['concurrency']:<4} "
+        f"{result['throughput_rps']:>9.1f} req/s "
+        f"p50={result['p50_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms "
+        f"threads={threadpool:<7} rss={result['peak_rss_kb']}kB "
+        f"errors={result['errors']}"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Load test equivalent endpoints wired with Depends and inject.",
+    )
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--width", type=int, default=3)
+    parser.add_argument("--mix", choices=MIXES, action="append")
+    parser.add_argument("--wiring", choices=WIRINGS, action="append")
+    parser.add_argument("--concurrency", type=int, action="append")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument(
+        "--uvicorn",
+        action="store_true",
+        help="serve each app with a local uvicorn instead of in-process",
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        LoadScenario(args.depth, args.width, mix, wiring)
+        for mix in args.mix or ("sync", "async", "mixed")
+        for wiring in args.wiring or WIRINGS
+    ]
+    report = run(
+        scenarios,
+        args.concurrency or (1, 16, 64),
+        args.requests,
+        args.warmup,
+        uvicorn=args.uvicorn,
+    )
+    for result in report["results"]:
+        sys.stderr.write(_format(result) + "\n")
+    if args.output:
+        with open(args.output, "w") as file:  # noqa: PTH123
+            file.write(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
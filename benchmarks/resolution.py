@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from typing import Any, Literal
+
+import fastapi
+from fastapi import Depends, FastAPI
+from fastapi.dependencies.utils import get_dependant, solve_dependencies
+from starlette.requests import Request
+
+from fastapi_inject import enable_injection, inject
+from fastapi_inject.utils import Dependency
+
+Mix = Literal["sync", "sync_generator", "async", "async_generator", "mixed"]
+
+MIXES: tuple[Mix, ...] = (
+    "sync",
+    "sync_generator",
+    "async",
+    "async_generator",
+    "mixed",
+)
+SHAPES = ((1, 1), (3, 1), (3, 3), (6, 2), (2, 8))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    depth: int
+    width: int
+    mix: Mix
+    overrides: bool = False
+    codegen: bool = False
+
+    @property
+    def name(self) -> str:
+        suffix = "-overrides" if self.overrides else ""
+        suffix += "-codegen" if self.codegen else ""
+        return f"{self.mix}-d{self.depth}-w{self.width}{suffix}"
+
+    @property
+    def is_async(self) -> bool:
+        return self.mix not in ("sync", "sync_generator")
+
+
+@dataclass(frozen=True)
+class Result:
+    scenario: str
+    depth: int
+    width: int
+    mix: Mix
+    overrides: bool
+    codegen: bool
+    direct_us: float
+    inject_us: float
+    fastapi_us: float
+
+    @property
+    def overhead_us(self) -> float:
+        return self.inject_us - self.direct_us
+
+
+def _make_function(kind: str, name: str, params: Sequence[Dependency]) -> Dependency:
+    if kind == "sync":
+
+        def dependency(**kwargs: Any) -> int:  # noqa: ANN401
+            return len(kwargs)
+
+    elif kind == "sync_generator":
+
+        def dependency(**kwargs: Any) -> Iterator[int]:  # type: ignore[misc] # noqa: ANN401
+            yield len(kwargs)
+
+    elif kind == "async":
+
+        async def dependency(**kwargs: Any) -> int:  # type: ignore[misc] # noqa: ANN401
+            return len(kwargs)
+
+    else:
+
+        async def dependency(**kwargs: Any) -> Any:  # type: ignore[misc] # noqa: ANN401
+            yield len(kwargs)
+
+    dependency.__name__ = dependency.__qualname__ = name
+    dependency.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        [
+            inspect.Parameter(
+                f"p{index}",
+                inspect.Parameter.KEYWORD_ONLY,
+                default=Depends(param),
+            )
+            for index, param in enumerate(params)
+        ],
+    )
+    return dependency
+
+
+def _kind_at(mix: Mix, index: int) -> str:
+    if mix == "mixed":
+        return MIXES[index % 4]
+    return mix
+
+
+def build_graph(scenario: Scenario, app: FastAPI) -> Callable[..., Any]:
+    layer: list[Dependency] = []
+    index = 0
+    for level in range(scenario.depth):
+        next_layer = []
+        for column in range(scenario.width):
+            name = f"{scenario.name}_{level}_{column}"
+            next_layer.append(
+                _make_function(_kind_at(scenario.mix, index), name, layer),
+            )
+            index += 1
+        if level == 0 and scenario.overrides:
+            for leaf in next_layer:
+                app.dependency_overrides[leaf] = _make_function(
+                    _kind_at(scenario.mix, index),
+                    f"{leaf.__name__}_override",
+                    (),
+                )
+        layer = next_layer
+
+    target_kind = "async" if scenario.is_async else "sync"
+    return _make_function(target_kind, f"{scenario.name}_target", layer)
+
+
+def _per_call_us(
+    run: Callable[[int], float],
+    number: int,
+    repeat: int,
+) -> float:
+    run(max(1, number // 10))
+    return statistics.median(run(number) for _ in range(repeat)) / number * 1e6
+
+
+def _time_sync(func: Callable[[], Any]) -> Callable[[int], float]:
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+
+    return run
+
+
+def _time_async(func: Callable[[], Awaitable[Any]]) -> Callable[[int], float]:
+    async def run_async(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        return time.perf_counter() - start
+
+    def run(number: int) -> float:
+        return asyncio.run(run_async(number))
+
+    return run
+
+
+def _make_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [],
+            "query_string": b"",
+        },
+    )
+
+
+def _fastapi_call(target: Callable[..., Any], app: FastAPI) -> Callable[[], Any]:
+    dependant = get_dependant(path="/", call=target)
+    request = _make_request()
+
+    async def call() -> Any:  # noqa: ANN401
+        async with AsyncExitStack() as stack:
+            values, *_ = await solve_dependencies(
+                request=request,
+                dependant=dependant,
+                dependency_overrides_provider=app,
+                async_exit_stack=stack,
+            )
+            result = target(**values)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    return call
+
+
+def run_scenario(
+    scenario: Scenario,
+    app: FastAPI,
+    number: int,
+    repeat: int,
+) -> Result:
+    target = build_graph(scenario, app)
+    width = len(inspect.signature(target).parameters)
+    direct_kwargs = {f"p{index}": index for index in range(width)}
+    injected = inject(target, codegen=scenario.codegen)
+
+    if scenario.is_async:
+        direct_us = _per_call_us(
+            _time_async(lambda: target(**direct_kwargs)),
+            number,
+            repeat,
+        )
+        inject_us = _per_call_us(_time_async(injected), number, repeat)
+    else:
+        direct_us = _per_call_us(
+            _time_sync(lambda: target(**direct_kwargs)),
+            number,
+            repeat,
+        )
+        inject_us = _per_call_us(_time_sync(injected), number, repeat)
+    fastapi_us = _per_call_us(
+        _time_async(_fastapi_call(target, app)),
+        number,
+        repeat,
+    )
+    return Result(
+        scenario.name,
+        scenario.depth,
+        scenario.width,
+        scenario.mix,
+        scenario.overrides,
+        scenario.codegen,
+        round(direct_us, 3),
+        round(inject_us, 3),
+        round(fastapi_us, 3),
+    )
+
+
+def get_scenarios() -> list[Scenario]:
+    scenarios = [
+        Scenario(depth, width, mix) for mix in MIXES for depth, width in SHAPES
+    ]
+    scenarios.extend(
+        Scenario(depth, width, "mixed", overrides=True) for depth, width in SHAPES
+    )
+    # Generated resolvers only cover sync graphs
+    scenarios.extend(
+        Scenario(depth, width, mix, codegen=True)
+        for mix in ("sync", "sync_generator")
+        for depth, width in SHAPES
+    )
+    return scenarios
+
+
+def _get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    scenarios: Sequence[Scenario],
+    number: int,
+    repeat: int,
+) -> dict[str, Any]:
+    app = FastAPI()
+    enable_injection(app)
+    results = [run_scenario(scenario, app, number, repeat) for scenario in scenarios]
+    return {
+        "meta": {
+            "commit": _get_commit(),
+            "python": platform.python_version(),
+            "fastapi": fastapi.__version__,
+            "number": number,
+            "repeat": repeat,
+        },
+        "results": [
+            {**asdict(result), "overhead_us": round(result.overhead_us, 3)}
+            for result in results
+        ],
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    previous = {result["scenario"]: result for result in baseline["results"]}
+    lines = []
+    for result in current["results"]:
+        old = previous.get(result["scenario"])
+        if old is None:
+            continue
+        ratio = result["inject_us"] / old["inject_us"]
+        lines.append(
+            f"{result['scenario']:<36} {old['inject_us']:>10.2f}us "
+            f"{result['inject_us']:>10.2f}us {ratio:>7.2f}x",
+        )
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure per-call overhead of the resolution engine.",
+    )
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mix", choices=MIXES, action="append")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        scenario
+        for scenario in get_scenarios()
+        if args.mix is None or scenario.mix in args.mix
+    ]
+    report = run(scenarios, args.number, args.repeat)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:  # noqa: PTH123
+            file.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+    if args.compare:
+        with open(args.compare) as file:  # noqa: PTH123
+            baseline = json.load(file)
+        sys.stderr.write("\n".join(compare(baseline, report)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,67 @@
-from .enable import enable_injection
-from .injection import inject
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["enable_injection", "inject"]
+if TYPE_CHECKING:
+    from .batch import batch
+    from .blocking import BlockingMonitor, BlockingReport
+    from .container import Container
+    from .enable import enable_injection
+    from .hooks import InjectionHook, MetricsCollector, ResolutionEvent
+    from .injection import PrefetchHandle, inject, prefetch
+    from .lazy import AsyncLazy, Lazy
+    from .memo import Memo
+    from .overrides import override
+    from .params import Depends
+
+__all__ = [
+    "AsyncLazy",
+    "BlockingMonitor",
+    "BlockingReport",
+    "Container",
+    "Depends",
+    "InjectionHook",
+    "Lazy",
+    "Memo",
+    "MetricsCollector",
+    "PrefetchHandle",
+    "ResolutionEvent",
+    "batch",
+    "enable_injection",
+    "inject",
+    "override",
+    "prefetch",
+]
+
+# Submodules pull in FastAPI, so they are only imported once a name is used
+_modules = {
+    "AsyncLazy": ".lazy",
+    "BlockingMonitor": ".blocking",
+    "BlockingReport": ".blocking",
+    "Container": ".container",
+    "Depends": ".params",
+    "InjectionHook": ".hooks",
+    "Lazy": ".lazy",
+    "Memo": ".memo",
+    "MetricsCollector": ".hooks",
+    "PrefetchHandle": ".injection",
+    "ResolutionEvent": ".hooks",
+    "batch": ".batch",
+    "enable_injection": ".enable",
+    "inject": ".injection",
+    "override": ".overrides",
+    "prefetch": ".injection",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    module = _modules.get(name)
+    if module is None:
+        error_msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(error_msg)
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return [*globals(), *__all__]
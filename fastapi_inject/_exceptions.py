@@ -4,3 +4,26 @@ class NotEnabledError(Exception):
             "Injection must be enabled before using @inject. "
             "Please use enable_injection(app)",
         )
+
+
+class NoActiveRequestError(Exception):
+    def __init__(self) -> None:
+        super().__init__(
+            "No active request to inject from. "
+            "Request and BackgroundTasks can only be injected while handling a "
+            "request of an app passed to enable_injection(app)",
+        )
+
+
+class DependencyCycleError(Exception):
+    def __init__(self, cycle: list[str]) -> None:
+        self.cycle = cycle
+        super().__init__(f"Dependency cycle detected: {' -> '.join(cycle)}")
+
+
+class InjectionValidationError(Exception):
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = errors
+        super().__init__(
+            "Invalid injected functions:\n" + "\n".join(f"- {e}" for e in errors),
+        )
@@ -0,0 +1,345 @@
+import inspect
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack, suppress
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Generic, ParamSpec, Self, TypeVar, cast, overload
+
+import anyio
+from anyio.streams.memory import MemoryObjectSendStream
+
+from fastapi_inject.enable import (
+    _get_app_instance,
+    _get_app_scope,
+    _get_hooks,
+    _get_limiter,
+)
+from fastapi_inject.injection import (
+    _AsyncResolution,
+    _references,
+    _resolve_kwargs_async,
+    _resolve_kwargs_sync,
+    _SyncResolution,
+)
+from fastapi_inject.plan import DependencyNode, ResolutionPlan, _get_plan
+from fastapi_inject.teardown import AsyncTeardownStack
+
+if TYPE_CHECKING:
+    from anyio.abc import TaskGroup
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+_Outcome = tuple[Any, Exception | None]
+
+_NOT_ENTERED_MESSAGE = "Batch must be entered with 'with' before it is called"
+
+
+class _Batch:
+    __slots__ = (
+        "_args",
+        "_cache",
+        "_kwargs",
+        "_positional",
+        "_resolved",
+        "_root",
+        "func",
+        "plan",
+    )
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        self.func = func
+        self.plan: ResolutionPlan = _get_plan(func)
+        self._args = args
+        self._kwargs = kwargs
+        self._resolved: dict[str, Any] | None = None
+        self._positional: tuple[str, ...] = ()
+        self._root: DependencyNode | None = None
+        self._cache: dict[Hashable, Any] = {}
+
+    def _bind(self) -> tuple[dict[str, Any], DependencyNode]:
+        root = self.plan.root(_get_app_instance())
+        call_kwargs = self.plan.binding.bind(self._args, self._kwargs)
+        # Arguments of each call are bound to the parameters still left over
+        self._positional = tuple(
+            edge.name
+            for edge in root.edges
+            if edge.node is None and edge.name not in call_kwargs
+        )
+        unbound = set(self._positional)
+        shared = tuple(
+            edge
+            for edge in root.edges
+            if edge.node is None or not _references(edge.node, unbound, set())
+        )
+        # Dependencies that read the arguments of each call are resolved per call
+        self._root = root if len(shared) < len(root.edges) else None
+        return call_kwargs, DependencyNode(root.call, root.kind, shared)
+
+    def _get_call_kwargs(
+        self,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        if self._resolved is None:
+            raise RuntimeError(_NOT_ENTERED_MESSAGE)
+        return {
+            **self._resolved,
+            **dict(zip(self._positional, args, strict=False)),
+            **kwargs,
+        }
+
+
+class SyncBatch(_Batch, Generic[P, T]):
+    __slots__ = ("_exit_stack",)
+
+    def __init__(
+        self,
+        func: Callable[P, T],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        super().__init__(func, args, kwargs)
+        self._exit_stack = ExitStack()
+
+    def __enter__(self) -> Self:
+        call_kwargs, root = self._bind()
+        with self._exit_stack as exit_stack:
+            resolution = _SyncResolution(
+                call_kwargs,
+                exit_stack,
+                _get_app_scope(),
+                hooks=_get_hooks(),
+            )
+            self._resolved = call_kwargs | _resolve_kwargs_sync(root, resolution)
+            self._cache = resolution.cache
+            self._exit_stack = exit_stack.pop_all()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._resolved = None
+        self._exit_stack.__exit__(exc_type, exc, tb)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        return self._call(self._get_call_kwargs(args, kwargs))
+
+    def _call_item(self, item: Any) -> T:  # noqa: ANN401
+        return self._call(self._get_call_kwargs((item,), {}))
+
+    def _call(self, call_kwargs: dict[str, Any]) -> T:
+        if self._root is None:
+            return self.func(**call_kwargs)
+        with ExitStack() as exit_stack:
+            resolution = _SyncResolution(
+                call_kwargs,
+                exit_stack,
+                _get_app_scope(),
+                hooks=_get_hooks(),
+            )
+            # Shared dependencies are reused, but values of one call stay in it
+            resolution.cache = dict(self._cache)
+            return self.func(**_resolve_kwargs_sync(self._root, resolution))
+
+    def map(self, items: Iterable[Any], *, concurrency: int = 1) -> Iterator[T]:
+        if concurrency <= 1:
+            for item in items:
+                yield self._call_item(item)
+            return
+        # Results are yielded as they finish, so order may differ from items
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending: set[Future[T]] = set()
+            for item in items:
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(self._call_item, item))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+class AsyncBatch(_Batch, Generic[P, T]):
+    __slots__ = ("_exit_stack", "_task_group")
+
+    def __init__(
+        self,
+        func: Callable[P, Awaitable[T]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        super().__init__(func, args, kwargs)
+        self._exit_stack = AsyncTeardownStack()
+        self._task_group: TaskGroup | None = None
+
+    async def __aenter__(self) -> Self:
+        call_kwargs, root = self._bind()
+        async with self._exit_stack as exit_stack:
+            resolution = _AsyncResolution(
+                call_kwargs,
+                exit_stack,
+                _get_app_scope(),
+                hooks=_get_hooks(),
+                limiter=_get_limiter(),
+            )
+            self._resolved = call_kwargs | await _resolve_kwargs_async(
+                root,
+                resolution,
+            )
+            self._cache = resolution.cache
+            self._exit_stack = exit_stack.pop_all()
+        # Concurrent maps run in the batch's own task group, as an async
+        # generator can't yield from inside one if its consumer stops early
+        task_group = anyio.create_task_group()
+        await task_group.__aenter__()
+        self._task_group = task_group
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> bool:
+        self._resolved = None
+        task_group, self._task_group = self._task_group, None
+        try:
+            if task_group is not None:
+                task_group.cancel_scope.cancel()
+                await task_group.__aexit__(None, None, None)
+        finally:
+            suppressed = await self._exit_stack.__aexit__(exc_type, exc, tb)
+        return suppressed
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        return await self._call(self._get_call_kwargs(args, kwargs))
+
+    async def _call_item(self, item: Any) -> T:  # noqa: ANN401
+        return await self._call(self._get_call_kwargs((item,), {}))
+
+    async def _call(self, call_kwargs: dict[str, Any]) -> T:
+        if self._root is None:
+            return await self.func(**call_kwargs)
+        async with AsyncTeardownStack() as exit_stack:
+            resolution = _AsyncResolution(
+                call_kwargs,
+                exit_stack,
+                _get_app_scope(),
+                hooks=_get_hooks(),
+                limiter=_get_limiter(),
+            )
+            resolution.cache = dict(self._cache)
+            result = await self.func(
+                **await _resolve_kwargs_async(self._root, resolution),
+            )
+        # The teardown stack may suppress errors, so the return can't be inside
+        return result  # noqa: RET504
+
+    async def map(
+        self,
+        items: Iterable[Any],
+        *,
+        concurrency: int = 1,
+    ) -> AsyncIterator[T]:
+        if concurrency <= 1:
+            for item in items:
+                yield await self._call_item(item)
+            return
+        if self._task_group is None:
+            raise RuntimeError(_NOT_ENTERED_MESSAGE)
+        # Results are yielded as they finish, so order may differ from items
+        send_stream, receive_stream = anyio.create_memory_object_stream[_Outcome](
+            concurrency,
+        )
+        cancel_scope = anyio.CancelScope()
+        self._task_group.start_soon(
+            self._produce,
+            items,
+            concurrency,
+            send_stream,
+            cancel_scope,
+        )
+        try:
+            async with receive_stream:
+                async for result, error in receive_stream:
+                    if error is not None:
+                        raise error
+                    yield result
+        finally:
+            # Stops calls still running once the consumer is done
+            cancel_scope.cancel()
+
+    async def _produce(
+        self,
+        items: Iterable[Any],
+        concurrency: int,
+        send_stream: MemoryObjectSendStream[_Outcome],
+        cancel_scope: anyio.CancelScope,
+    ) -> None:
+        semaphore = anyio.Semaphore(concurrency)
+        with cancel_scope:
+            async with send_stream, anyio.create_task_group() as tg:
+                for item in items:
+                    await semaphore.acquire()
+                    tg.start_soon(self._run, item, semaphore, send_stream.clone())
+
+    async def _run(
+        self,
+        item: Any,  # noqa: ANN401
+        semaphore: anyio.Semaphore,
+        send_stream: MemoryObjectSendStream[_Outcome],
+    ) -> None:
+        async with send_stream:
+            # Errors are raised to the consumer rather than in the task group
+            try:
+                outcome: _Outcome = (await self._call_item(item), None)
+            except Exception as error:  # noqa: BLE001
+                outcome = (None, error)
+            finally:
+                semaphore.release()
+            with suppress(anyio.BrokenResourceError):
+                await send_stream.send(outcome)
+
+
+@overload
+def batch(
+    func: Callable[P, Awaitable[T]],
+    *args: Any,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> AsyncBatch[P, T]: ...
+
+
+@overload
+def batch(
+    func: Callable[P, T],
+    *args: Any,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> SyncBatch[P, T]: ...
+
+
+def batch(
+    func: Callable[P, T] | Callable[P, Awaitable[T]],
+    *args: Any,
+    **kwargs: Any,
+) -> SyncBatch[P, T] | AsyncBatch[P, T]:
+    if inspect.iscoroutinefunction(func):
+        return AsyncBatch(func, args, kwargs)
+    return SyncBatch(cast(Callable[P, T], func), args, kwargs)
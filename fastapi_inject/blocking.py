@@ -0,0 +1,220 @@
+import logging
+import random
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import Generic, Literal, TypeVar
+
+from fastapi_inject.bridge import _in_event_loop
+from fastapi_inject.plan import DependencyNode
+from fastapi_inject.utils import Dependency, SyncContextStack, _get_name
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BlockingPhase = Literal["resolve", "teardown"]
+
+
+class BlockingReport:
+    __slots__ = ("call_site", "dependency", "duration", "offloaded", "phase")
+
+    def __init__(
+        self,
+        dependency: Dependency,
+        duration: float,
+        call_site: str,
+        phase: BlockingPhase = "resolve",
+        *,
+        offloaded: bool = False,
+    ) -> None:
+        self.dependency = dependency
+        self.duration = duration
+        self.call_site = call_site
+        self.phase = phase
+        self.offloaded = offloaded
+
+    def __str__(self) -> str:
+        action = ", now offloaded to the threadpool" if self.offloaded else ""
+        return (
+            f"{_get_name(self.dependency)} blocked the event loop for "
+            f"{self.duration * 1e3:.1f}ms during {self.phase}, called from "
+            f"{self.call_site}{action}"
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({_get_name(self.dependency)}, "
+            f"duration={self.duration!r}, call_site={self.call_site!r}, "
+            f"phase={self.phase!r}, offloaded={self.offloaded!r})"
+        )
+
+
+def _log_report(report: BlockingReport) -> None:
+    logger.warning("%s", report)
+
+
+class BlockingMonitor:
+    def __init__(
+        self,
+        threshold: float = 0.01,
+        *,
+        sample_rate: float = 1.0,
+        offload: bool = False,
+        on_report: Callable[[BlockingReport], None] = _log_report,
+        max_reports: int = 100,
+    ) -> None:
+        if not 0 < sample_rate <= 1:
+            error_msg = "sample_rate must be in (0, 1]"
+            raise ValueError(error_msg)
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.offload = offload
+        self.on_report = on_report
+        self.reports: deque[BlockingReport] = deque(maxlen=max_reports)
+        self._lock = threading.Lock()
+
+    def sample(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate  # noqa: S311
+
+    def report(self, report: BlockingReport) -> None:
+        with self._lock:
+            self.reports.append(report)
+        self.on_report(report)
+
+
+def _get_call_site(depth: int) -> str:
+    frame = sys._getframe(depth + 1)  # noqa: SLF001
+    code = frame.f_code
+    return f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
+
+
+class _LoopWatch:
+    __slots__ = ("call_site", "monitor", "thread")
+
+    def __init__(self, monitor: BlockingMonitor, call_site: str) -> None:
+        self.monitor = monitor
+        self.call_site = call_site
+        self.thread = threading.get_ident()
+
+    def check(
+        self,
+        dependency: Dependency,
+        start: float,
+        phase: BlockingPhase = "resolve",
+        *,
+        offloaded: bool = False,
+    ) -> bool:
+        duration = time.perf_counter() - start
+        if duration < self.monitor.threshold:
+            return False
+        self.monitor.report(
+            BlockingReport(
+                dependency,
+                duration,
+                self.call_site,
+                phase,
+                offloaded=offloaded,
+            ),
+        )
+        return True
+
+    def watch_teardown(
+        self,
+        node: DependencyNode,
+        exit_stack: SyncContextStack,
+    ) -> SyncContextStack:
+        return _WatchedStack(exit_stack, node.call, self)
+
+    def call_sync(self, node: DependencyNode, call: Callable[[], T]) -> T:
+        if threading.get_ident() != self.thread:
+            # Concurrent siblings run in worker threads, away from the loop
+            return call()
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            self.check(node.call, start)
+
+    async def call_async(
+        self,
+        node: DependencyNode,
+        call: Callable[[], Awaitable[T]],
+    ) -> T:
+        start = time.perf_counter()
+        try:
+            return await call()
+        finally:
+            offload = self.monitor.offload
+            if self.check(node.call, start, offloaded=offload) and offload:
+                # Later calls of the compiled plan run the dependency in a thread
+                node.execution = "threadpool"
+
+
+class _WatchedContext(Generic[T]):
+    __slots__ = ("cm", "dependency", "watch")
+
+    def __init__(
+        self,
+        cm: AbstractContextManager[T],
+        dependency: Dependency,
+        watch: _LoopWatch,
+    ) -> None:
+        self.cm = cm
+        self.dependency = dependency
+        self.watch = watch
+
+    def __enter__(self) -> T:
+        return self.cm.__enter__()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        if threading.get_ident() != self.watch.thread:
+            # Teardown pushed to the request or deferred runs away from the loop
+            return self.cm.__exit__(exc_type, exc_value, traceback)
+        start = time.perf_counter()
+        try:
+            return self.cm.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.watch.check(self.dependency, start, "teardown")
+
+
+class _WatchedStack:
+    __slots__ = ("dependency", "stack", "watch")
+
+    def __init__(
+        self,
+        stack: SyncContextStack,
+        dependency: Dependency,
+        watch: _LoopWatch,
+    ) -> None:
+        self.stack = stack
+        self.dependency = dependency
+        self.watch = watch
+
+    def enter_context(self, cm: AbstractContextManager[T]) -> T:
+        return self.stack.enter_context(
+            _WatchedContext[T](cm, self.dependency, self.watch),
+        )
+
+
+def _watch_loop(
+    monitor: BlockingMonitor | None,
+    *,
+    in_async: bool,
+) -> _LoopWatch | None:
+    # Sampling is checked first, so unsampled calls only pay for a random draw
+    if monitor is None or not monitor.sample():
+        return None
+    if not in_async and not _in_event_loop():
+        return None
+    # Skips this function and the injected wrapper to point at the caller
+    return _LoopWatch(monitor, _get_call_site(2))
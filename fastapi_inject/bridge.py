@@ -0,0 +1,106 @@
+import asyncio
+import atexit
+import threading
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    contextmanager,
+)
+from typing import Any, Protocol, TypeVar
+
+import anyio.from_thread
+from anyio.from_thread import BlockingPortal, start_blocking_portal
+
+T = TypeVar("T")
+
+
+class AsyncBridge(Protocol):
+    def call(
+        self,
+        func: Callable[..., Awaitable[T]],
+        /,
+        *args: Any,  # noqa: ANN401
+    ) -> T: ...
+
+    def wrap_async_context_manager(
+        self,
+        cm: AbstractAsyncContextManager[T],
+    ) -> AbstractContextManager[T]: ...
+
+
+class _WorkerThreadBridge:
+    __slots__ = ()
+
+    def call(
+        self,
+        func: Callable[..., Awaitable[T]],
+        /,
+        *args: Any,  # noqa: ANN401
+    ) -> T:
+        return anyio.from_thread.run(func, *args)  # type: ignore[arg-type]
+
+    @contextmanager
+    def wrap_async_context_manager(
+        self,
+        cm: AbstractAsyncContextManager[T],
+    ) -> Iterator[T]:
+        value = anyio.from_thread.run(cm.__aenter__)
+        try:
+            yield value
+        except BaseException as error:
+            if not anyio.from_thread.run(
+                cm.__aexit__,
+                type(error),
+                error,
+                error.__traceback__,
+            ):
+                raise
+        else:
+            anyio.from_thread.run(cm.__aexit__, None, None, None)
+
+
+_worker_thread_bridge = _WorkerThreadBridge()
+_portal: BlockingPortal | None = None
+_portal_lock = threading.Lock()
+
+
+def _get_shared_portal() -> BlockingPortal:
+    global _portal  # noqa: PLW0603
+    if _portal is None:
+        with _portal_lock:
+            if _portal is None:
+                portal_cm = start_blocking_portal()
+                _portal = portal_cm.__enter__()
+                atexit.register(portal_cm.__exit__, None, None, None)
+    return _portal
+
+
+def _in_worker_thread() -> bool:
+    try:
+        anyio.from_thread.check_cancelled()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _get_async_bridge() -> AsyncBridge:
+    if _in_worker_thread():
+        # Threadpool workers hop back to the loop that started them, so async
+        # dependencies share that loop's resources, like connection pools
+        return _worker_thread_bridge
+    if _in_event_loop():
+        error_msg = (
+            "Cannot run async dependencies from a sync function called on the "
+            "event loop, as it would block the loop"
+        )
+        raise RuntimeError(error_msg)
+    return _get_shared_portal()
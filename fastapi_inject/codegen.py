@@ -0,0 +1,108 @@
+from collections.abc import Callable, Collection, Hashable
+from contextlib import ExitStack, contextmanager
+from typing import Any, cast
+
+from fastapi_inject.plan import DependencyNode
+from fastapi_inject.utils import (
+    CallKind,
+    SyncGeneratorCallable,
+    _get_name,
+)
+
+GeneratedResolver = Callable[[dict[str, Any], ExitStack], Any]
+
+
+class _UnsupportedGraphError(Exception):
+    pass
+
+
+class _Emitter:
+    __slots__ = ("arguments", "lines", "namespace", "plain_names", "values")
+
+    def __init__(self, plain_names: Collection[str]) -> None:
+        self.plain_names = plain_names
+        self.lines: list[str] = []
+        self.namespace: dict[str, Any] = {}
+        self.values: dict[Hashable, str] = {}
+        self.arguments: dict[str, str] = {}
+
+    def argument(self, name: str) -> str:
+        variable = self.arguments.get(name)
+        if variable is None:
+            variable = self.arguments[name] = f"a{len(self.arguments)}"
+        return variable
+
+    def call_arguments(self, node: DependencyNode) -> str:
+        arguments = []
+        for edge in node.edges:
+            # Arguments of the injected function are looked up by name at any depth
+            if edge.name in self.plain_names:
+                value = self.argument(edge.name)
+            elif edge.node is None:
+                continue
+            elif edge.lazy or edge.scope != "call" or edge.timeout is not None:
+                raise _UnsupportedGraphError
+            elif edge.use_cache and edge.node.key in self.values:
+                value = self.values[edge.node.key]
+            else:
+                value = self.emit(edge.node)
+            arguments.append(f"{edge.name}={value}")
+        return ", ".join(arguments)
+
+    def emit(self, node: DependencyNode) -> str:
+        if node.memo is not None:
+            raise _UnsupportedGraphError
+        arguments = self.call_arguments(node)
+        index = len(self.lines)
+        call = f"d{index}"
+        if node.kind is CallKind.SYNC:
+            self.namespace[call] = node.call
+            expression = f"{call}({arguments})"
+        elif node.kind is CallKind.SYNC_GENERATOR:
+            self.namespace[call] = contextmanager(
+                cast(SyncGeneratorCallable[Any], node.call),
+            )
+            expression = f"enter({call}({arguments}))"
+        else:
+            raise _UnsupportedGraphError
+        variable = f"v{index}"
+        self.lines.append(f"    {variable} = {expression}")
+        self.values.setdefault(node.key, variable)
+        return variable
+
+
+def _generate_resolver(
+    root: DependencyNode,
+    plain_names: Collection[str],
+) -> GeneratedResolver | None:
+    emitter = _Emitter(plain_names)
+    try:
+        arguments = emitter.call_arguments(root)
+    except _UnsupportedGraphError:
+        return None
+    emitter.namespace["func"] = root.call
+    source = [
+        "def resolve(call_kwargs, exit_stack):",
+        "    enter = exit_stack.enter_context",
+        *(
+            f"    {variable} = call_kwargs[{name!r}]"
+            for name, variable in emitter.arguments.items()
+        ),
+        *emitter.lines,
+        f"    return func({arguments})",
+    ]
+    filename = f"<fastapi_inject {_get_name(root.call)}>"
+    code = compile("\n".join(source), filename, "exec")
+    exec(code, emitter.namespace)  # noqa: S102
+    return emitter.namespace["resolve"]
+
+
+class _GeneratedResolver:
+    __slots__ = ("names", "resolve", "root")
+
+    def __init__(self, root: DependencyNode) -> None:
+        self.root = root
+        # Generated code assumes exactly these arguments are bound, so calls
+        # passing a dependency's value explicitly take the generic path instead
+        self.names = {edge.name for edge in root.edges if edge.node is None}
+        self.resolve = _generate_resolver(root, self.names)
@@ -0,0 +1,57 @@
+import contextvars
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SiblingPool:
+    __slots__ = ("_executor", "_lock", "_slots", "max_workers")
+
+    def __init__(self, max_workers: int) -> None:
+        if max_workers < 1:
+            error_msg = "concurrency must be at least 1"
+            raise ValueError(error_msg)
+        self.max_workers = max_workers
+        self._slots = threading.Semaphore(max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.max_workers,
+                        thread_name_prefix="fastapi-inject",
+                    )
+        return self._executor
+
+    def try_submit(
+        self,
+        func: Callable[..., T],
+        *args: Any,  # noqa: ANN401
+    ) -> Future[T] | None:
+        # Work is only handed off when a worker is free. Otherwise the caller runs
+        # it itself, so threads waiting on their children can never starve the pool.
+        if not self._slots.acquire(blocking=False):
+            return None
+        context = contextvars.copy_context()
+
+        def run() -> T:
+            try:
+                return context.run(func, *args)
+            finally:
+                self._slots.release()
+
+        try:
+            return self._get_executor().submit(run)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
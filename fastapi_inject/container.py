@@ -0,0 +1,45 @@
+from collections.abc import Callable, Mapping
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+from fastapi_inject._exceptions import NotEnabledError
+from fastapi_inject.overrides import DependencyCallable, DependencyOverrides
+
+if TYPE_CHECKING:
+    from contextlib import AbstractAsyncContextManager
+
+
+class Container:
+    __slots__ = ("_context", "_lifespan", "dependency_overrides")
+
+    def __init__(
+        self,
+        dependency_overrides: Mapping[DependencyCallable, DependencyCallable]
+        | None = None,
+    ) -> None:
+        self.dependency_overrides: dict[DependencyCallable, DependencyCallable] = (
+            DependencyOverrides(dependency_overrides)
+        )
+        self._lifespan: Callable[[], AbstractAsyncContextManager[Any]] | None = None
+        self._context: AbstractAsyncContextManager[Any] | None = None
+
+    async def __aenter__(self) -> Self:
+        if self._lifespan is None:
+            raise NotEnabledError
+        context = self._lifespan()
+        await context.__aenter__()
+        self._context = context
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        context, self._context = self._context, None
+        if context is not None:
+            await context.__aexit__(exc_type, exc_value, traceback)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(overrides={len(self.dependency_overrides)})"
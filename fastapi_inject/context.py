@@ -0,0 +1,130 @@
+from contextlib import AsyncExitStack, ExitStack
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from fastapi import BackgroundTasks, Request
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fastapi_inject._exceptions import NoActiveRequestError
+from fastapi_inject.teardown import AsyncTeardownStack
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+
+class RequestContext:
+    __slots__ = (
+        "_background_tasks",
+        "_closed",
+        "_request",
+        "_watched_stack",
+        "async_cache",
+        "receive",
+        "scope",
+        "sync_cache",
+    )
+
+    def __init__(self, scope: Scope, receive: Receive) -> None:
+        self.scope = scope
+        self.receive = receive
+        self.sync_cache: dict[Hashable, Any] = {}
+        self.async_cache: dict[Hashable, Any] = {}
+        self._request: Request | None = None
+        self._background_tasks: BackgroundTasks | None = None
+        self._watched_stack: AsyncExitStack | None = None
+        self._closed = False
+
+    @property
+    def request(self) -> Request:
+        if self._request is None:
+            self._request = Request(self.scope, self.receive)
+        return self._request
+
+    @property
+    def background_tasks(self) -> BackgroundTasks:
+        if self._background_tasks is None:
+            self._background_tasks = BackgroundTasks()
+        return self._background_tasks
+
+    @property
+    def exit_stack(self) -> AsyncExitStack | None:
+        # Set by FastAPI's route handler, so only available inside endpoints
+        request_stack: AsyncExitStack | None = self.scope.get("fastapi_astack")
+        if request_stack is None or self._closed:
+            return None
+        if request_stack is not self._watched_stack:
+            self._watched_stack = request_stack
+            request_stack.callback(self.close)
+        return request_stack
+
+    def close(self) -> None:
+        # Teardown pushed onto the request's exit stack once it is closed would
+        # never run, so later calls tear down their own dependencies
+        self._closed = True
+
+    def push_sync_teardown(self, exit_stack: ExitStack) -> None:
+        request_stack = self.exit_stack
+        if request_stack is not None:
+            request_stack.push_async_callback(run_in_threadpool, exit_stack.close)
+
+    def push_async_teardown(self, exit_stack: AsyncTeardownStack) -> None:
+        request_stack = self.exit_stack
+        if request_stack is not None:
+            request_stack.push_async_exit(exit_stack.__aexit__)
+
+    async def run_background_tasks(self) -> None:
+        if self._background_tasks is not None:
+            await self._background_tasks()
+
+
+_request_context: ContextVar[RequestContext | None] = ContextVar(
+    "fastapi_inject_request_context",
+    default=None,
+)
+
+
+def _get_endpoint_context() -> RequestContext | None:
+    context = _request_context.get()
+    if context is None or context.exit_stack is None:
+        return None
+    return context
+
+
+def _get_current_request() -> Request:
+    context = _request_context.get()
+    if context is None:
+        raise NoActiveRequestError
+    return context.request
+
+
+def _get_current_background_tasks() -> BackgroundTasks:
+    context = _request_context.get()
+    if context is None:
+        raise NoActiveRequestError
+    return context.background_tasks
+
+
+class InjectionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        context = RequestContext(scope, receive)
+
+        async def send_response(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Streamed bodies and background tasks run after FastAPI closed
+                # the exit stack, even if no injected call was made before that
+                context.close()
+            await send(message)
+
+        token = _request_context.set(context)
+        try:
+            await self.app(scope, receive, send_response)
+        finally:
+            _request_context.reset(token)
+        await context.run_background_tasks()
@@ -1,21 +1,135 @@
+import functools
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
+
+from anyio import CapacityLimiter
 from fastapi import FastAPI
+from starlette.applications import Starlette
 
 from ._exceptions import NotEnabledError
+from .blocking import BlockingMonitor
+from .container import Container
+from .context import InjectionMiddleware
+from .hooks import Hooks, InjectionHook
+from .overrides import OverridesProvider, _get_dependency_overrides
+from .scopes import AppScope
+
+app_instance: OverridesProvider | None = None
+app_scope: AppScope | None = None
+app_hooks: Hooks = ()
+app_max_concurrency: int | None = None
+app_limiter: CapacityLimiter | None = None
+app_process_workers: int | None = None
+app_blocking_monitor: BlockingMonitor | None = None
+
+
+@asynccontextmanager
+async def _app_scope_lifespan(
+    app: OverridesProvider,
+    scope: AppScope,
+    *,
+    warm: bool,
+) -> AsyncIterator[None]:
+    try:
+        if warm:
+            from fastapi_inject.injection import _warm_up  # noqa: PLC0415
+
+            await _warm_up(app)
+        yield
+    finally:
+        await scope.aclose()
 
-app_instance: FastAPI | None = None
 
+def _manage_app_scope(app: FastAPI, scope: AppScope, *, warm: bool) -> None:
+    lifespan_context = app.router.lifespan_context
 
-def enable_injection(app: FastAPI) -> None:
-    global app_instance  # noqa: PLW0603
+    @asynccontextmanager
+    async def lifespan(starlette_app: Starlette) -> AsyncIterator[Any]:
+        async with (
+            _app_scope_lifespan(app, scope, warm=warm),
+            lifespan_context(starlette_app) as state,
+        ):
+            yield state
+
+    app.router.lifespan_context = lifespan
+
+
+def enable_injection(  # noqa: PLR0913
+    app: FastAPI | Container,
+    *,
+    hooks: Sequence[InjectionHook] = (),
+    max_concurrency: int | None = None,
+    warm: bool = False,
+    process_workers: int | None = None,
+    blocking_monitor: BlockingMonitor | None = None,
+) -> None:
+    global app_instance, app_scope, app_hooks  # noqa: PLW0603
+    global app_max_concurrency, app_limiter, app_process_workers  # noqa: PLW0603
+    global app_blocking_monitor  # noqa: PLW0603
+    app_hooks = tuple(hooks)
+    app_max_concurrency = max_concurrency
+    app_limiter = None
+    app_process_workers = process_workers
+    app_blocking_monitor = blocking_monitor
+    if app is app_instance:
+        return
+    _get_dependency_overrides(app)
+    app_scope = AppScope()
+    if isinstance(app, Container):
+        # Without an app there are no requests, so only the app scope is managed
+        app._lifespan = functools.partial(  # noqa: SLF001
+            _app_scope_lifespan,
+            app,
+            app_scope,
+            warm=warm,
+        )
+    else:
+        app.add_middleware(InjectionMiddleware)
+        _manage_app_scope(app, app_scope, warm=warm)
     app_instance = app
 
 
 def _disable_injection() -> None:
-    global app_instance  # noqa: PLW0603
+    global app_instance, app_scope, app_hooks  # noqa: PLW0603
+    global app_max_concurrency, app_limiter, app_process_workers  # noqa: PLW0603
+    global app_blocking_monitor  # noqa: PLW0603
     app_instance = None
+    app_scope = None
+    app_hooks = ()
+    app_max_concurrency = None
+    app_limiter = None
+    app_process_workers = None
+    app_blocking_monitor = None
 
 
-def _get_app_instance() -> FastAPI:
+def _get_app_instance() -> OverridesProvider:
     if app_instance is None:
         raise NotEnabledError
     return app_instance
+
+
+def _get_app_scope() -> AppScope:
+    if app_scope is None:
+        raise NotEnabledError
+    return app_scope
+
+
+def _get_hooks() -> Hooks:
+    return app_hooks
+
+
+def _get_limiter() -> CapacityLimiter | None:
+    global app_limiter  # noqa: PLW0603
+    if app_limiter is None and app_max_concurrency is not None:
+        # Created on first use, as older anyio versions need a running event loop
+        app_limiter = CapacityLimiter(app_max_concurrency)
+    return app_limiter
+
+
+def _get_process_workers() -> int | None:
+    return app_process_workers
+
+
+def _get_blocking_monitor() -> BlockingMonitor | None:
+    return app_blocking_monitor
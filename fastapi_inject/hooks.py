@@ -0,0 +1,339 @@
+import bisect
+import threading
+import time
+from collections.abc import Sequence
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from types import TracebackType
+from typing import Any, Generic, Literal, TypeVar
+
+from fastapi_inject.bridge import AsyncBridge
+from fastapi_inject.plan import DependencyNode
+from fastapi_inject.utils import (
+    AsyncContextStack,
+    CallKind,
+    Dependency,
+    Execution,
+    SyncContextStack,
+    _call_dependency_async,
+    _call_dependency_sync,
+    _get_name,
+)
+
+T = TypeVar("T")
+
+HookKind = Literal[
+    "sync",
+    "threadpool",
+    "async",
+    "sync_generator",
+    "async_generator",
+]
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+
+class ResolutionEvent:
+    __slots__ = ("cache_hit", "dependency", "duration", "error", "kind")
+
+    def __init__(
+        self,
+        dependency: Dependency,
+        kind: HookKind,
+        duration: float,
+        cache_hit: bool = False,  # noqa: FBT001, FBT002
+        error: BaseException | None = None,
+    ) -> None:
+        self.dependency = dependency
+        self.kind = kind
+        self.duration = duration
+        self.cache_hit = cache_hit
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({_get_name(self.dependency)}, "
+            f"kind={self.kind!r}, duration={self.duration!r}, "
+            f"cache_hit={self.cache_hit!r}, error={self.error!r})"
+        )
+
+
+class InjectionHook:
+    def on_resolve(self, event: ResolutionEvent) -> None:
+        pass
+
+    def on_teardown(self, event: ResolutionEvent) -> None:
+        pass
+
+
+Hooks = tuple[InjectionHook, ...]
+
+
+def _get_hook_kind(kind: CallKind, execution: Execution, *, in_async: bool) -> HookKind:
+    if kind is CallKind.SYNC and in_async and execution != "inline":
+        return "threadpool"
+    return kind.value  # type: ignore[return-value]
+
+
+def _emit_resolve(hooks: Hooks, event: ResolutionEvent) -> None:
+    for hook in hooks:
+        hook.on_resolve(event)
+
+
+def _emit_teardown(hooks: Hooks, event: ResolutionEvent) -> None:
+    for hook in hooks:
+        hook.on_teardown(event)
+
+
+class _InstrumentedContext(Generic[T]):
+    __slots__ = ("cm", "dependency", "hooks", "kind")
+
+    def __init__(
+        self,
+        cm: Any,  # noqa: ANN401
+        dependency: Dependency,
+        kind: HookKind,
+        hooks: Hooks,
+    ) -> None:
+        self.cm = cm
+        self.dependency = dependency
+        self.kind = kind
+        self.hooks = hooks
+
+    def _emit(self, start: float, error: BaseException | None = None) -> None:
+        _emit_teardown(
+            self.hooks,
+            ResolutionEvent(
+                self.dependency,
+                self.kind,
+                time.perf_counter() - start,
+                error=error,
+            ),
+        )
+
+    def __enter__(self) -> T:
+        return self.cm.__enter__()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        start = time.perf_counter()
+        try:
+            suppress = self.cm.__exit__(exc_type, exc_value, traceback)
+        except BaseException as error:
+            self._emit(start, error)
+            raise
+        self._emit(start)
+        return suppress
+
+    async def __aenter__(self) -> T:
+        return await self.cm.__aenter__()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        start = time.perf_counter()
+        try:
+            suppress = await self.cm.__aexit__(exc_type, exc_value, traceback)
+        except BaseException as error:
+            self._emit(start, error)
+            raise
+        self._emit(start)
+        return suppress
+
+
+class _InstrumentedStack:
+    __slots__ = ("dependency", "hooks", "kind", "stack")
+
+    def __init__(
+        self,
+        stack: Any,  # noqa: ANN401
+        dependency: Dependency,
+        kind: HookKind,
+        hooks: Hooks,
+    ) -> None:
+        self.stack = stack
+        self.dependency = dependency
+        self.kind = kind
+        self.hooks = hooks
+
+    def enter_context(self, cm: AbstractContextManager[T]) -> T:
+        stack: SyncContextStack = self.stack
+        return stack.enter_context(
+            _InstrumentedContext[T](cm, self.dependency, self.kind, self.hooks),
+        )
+
+    async def enter_async_context(self, cm: AbstractAsyncContextManager[T]) -> T:
+        stack: AsyncContextStack = self.stack
+        return await stack.enter_async_context(
+            _InstrumentedContext[T](cm, self.dependency, self.kind, self.hooks),
+        )
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "counts", "total")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> dict[str, Any]:
+        bounds = [*self.buckets, float("inf")]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": dict(zip(bounds, self.counts, strict=True)),
+        }
+
+
+class _DependencyMetrics:
+    __slots__ = (
+        "cache_hits",
+        "calls",
+        "errors",
+        "latency",
+        "teardown_errors",
+        "teardown_latency",
+    )
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.calls = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.teardown_errors = 0
+        self.latency = _Histogram(buckets)
+        self.teardown_latency = _Histogram(buckets)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "teardown_errors": self.teardown_errors,
+            "latency": self.latency.snapshot(),
+            "teardown_latency": self.teardown_latency.snapshot(),
+        }
+
+
+class MetricsCollector(InjectionHook):
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._metrics: dict[str, _DependencyMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _get_metrics(self, dependency: Dependency) -> _DependencyMetrics:
+        name = _get_name(dependency)
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            metrics = self._metrics[name] = _DependencyMetrics(self.buckets)
+        return metrics
+
+    def on_resolve(self, event: ResolutionEvent) -> None:
+        with self._lock:
+            metrics = self._get_metrics(event.dependency)
+            if event.cache_hit:
+                metrics.cache_hits += 1
+                return
+            metrics.calls += 1
+            if event.error is not None:
+                metrics.errors += 1
+            metrics.latency.observe(event.duration)
+
+    def on_teardown(self, event: ResolutionEvent) -> None:
+        with self._lock:
+            metrics = self._get_metrics(event.dependency)
+            if event.error is not None:
+                metrics.teardown_errors += 1
+            metrics.teardown_latency.observe(event.duration)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: metrics.snapshot() for name, metrics in self._metrics.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+def _call_instrumented_sync(
+    node: DependencyNode,
+    exit_stack: SyncContextStack,
+    kwargs: dict[str, Any],
+    hooks: Hooks,
+    bridge: AsyncBridge | None = None,
+) -> Any:  # noqa: ANN401
+    kind = _get_hook_kind(node.kind, node.execution, in_async=False)
+    if node.kind.is_generator:
+        exit_stack = _InstrumentedStack(exit_stack, node.call, kind, hooks)
+    start = time.perf_counter()
+    try:
+        value = _call_dependency_sync(
+            node.call,
+            exit_stack,
+            kwargs,
+            node.kind,
+            bridge,
+        )
+    except BaseException as error:
+        duration = time.perf_counter() - start
+        _emit_resolve(hooks, ResolutionEvent(node.call, kind, duration, error=error))
+        raise
+    duration = time.perf_counter() - start
+    _emit_resolve(hooks, ResolutionEvent(node.call, kind, duration))
+    return value
+
+
+async def _call_instrumented_async(
+    node: DependencyNode,
+    exit_stack: AsyncContextStack,
+    kwargs: dict[str, Any],
+    hooks: Hooks,
+    execution: Execution | None = None,
+) -> Any:  # noqa: ANN401
+    kind = _get_hook_kind(node.kind, node.execution, in_async=True)
+    if node.kind.is_generator:
+        exit_stack = _InstrumentedStack(exit_stack, node.call, kind, hooks)
+    start = time.perf_counter()
+    try:
+        value = await _call_dependency_async(
+            node.call,
+            exit_stack,
+            kwargs,
+            node.kind,
+            node.execution if execution is None else execution,
+        )
+    except BaseException as error:
+        duration = time.perf_counter() - start
+        _emit_resolve(hooks, ResolutionEvent(node.call, kind, duration, error=error))
+        raise
+    duration = time.perf_counter() - start
+    _emit_resolve(hooks, ResolutionEvent(node.call, kind, duration))
+    return value
+
+
+def _emit_cache_hit(hooks: Hooks, node: DependencyNode, *, in_async: bool) -> None:
+    kind = _get_hook_kind(node.kind, node.execution, in_async=in_async)
+    _emit_resolve(hooks, ResolutionEvent(node.call, kind, 0.0, cache_hit=True))
@@ -1,206 +1,1155 @@
 import functools
 import inspect
-from collections.abc import Awaitable, Callable, Iterator
-from contextlib import AsyncExitStack, ExitStack
-from typing import Any, NamedTuple, ParamSpec, TypeVar, cast, overload
+import threading
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterator,
+)
+from concurrent.futures import Future, wait
+from contextlib import ExitStack, aclosing, asynccontextmanager, suppress
+from contextvars import ContextVar
+from typing import Any, Generic, ParamSpec, TypeVar, cast, overload
 
-import asyncer
-from fastapi import FastAPI
-from fastapi.params import Depends
+import anyio
+from anyio import CapacityLimiter
+from anyio.abc import TaskGroup
 
-from fastapi_inject.enable import _get_app_instance
+from fastapi_inject.blocking import _LoopWatch, _watch_loop
+from fastapi_inject.bridge import AsyncBridge, _get_async_bridge
+from fastapi_inject.codegen import _GeneratedResolver
+from fastapi_inject.concurrency import SiblingPool
+from fastapi_inject.context import _get_endpoint_context
+from fastapi_inject.enable import (
+    _get_app_instance,
+    _get_app_scope,
+    _get_blocking_monitor,
+    _get_hooks,
+    _get_limiter,
+    _get_process_workers,
+)
+from fastapi_inject.hooks import (
+    Hooks,
+    _call_instrumented_async,
+    _call_instrumented_sync,
+    _emit_cache_hit,
+)
+from fastapi_inject.lazy import AsyncLazy, Lazy
+from fastapi_inject.overrides import OverridesProvider, _get_override
+from fastapi_inject.plan import (
+    DependencyEdge,
+    DependencyNode,
+    ParameterBinding,
+    _get_plan,
+)
+from fastapi_inject.scopes import AppScope
+from fastapi_inject.teardown import (
+    AsyncTeardownStack,
+    _defer_teardown_async,
+    _defer_teardown_sync,
+)
 from fastapi_inject.utils import (
-    AsyncDependency,
+    CallKind,
     Dependency,
-    SyncDependency,
+    Execution,
+    SyncContextStack,
     _call_dependency_async,
     _call_dependency_sync,
 )
+from fastapi_inject.validation import _register_injected, _validate_injected
 
 T = TypeVar("T")
 P = ParamSpec("P")
 
+# Set while a dependency holds a limiter token, so injected calls and lazy
+# dependencies it resolves itself don't wait for another token and deadlock
+_holding_limiter: ContextVar[bool] = ContextVar(
+    "fastapi_inject_holding_limiter",
+    default=False,
+)
 
-class DependencyInfo(NamedTuple):
-    name: str
-    dependency: Dependency | None
 
+class _ConcurrentSiblings:
+    __slots__ = ("lock", "pending", "pool")
 
-def _get_call_kwargs(
-    func: Callable[P, T],
-    *args: P.args,
-    **kwargs: P.kwargs,
+    def __init__(self, pool: SiblingPool) -> None:
+        self.pool = pool
+        self.lock = threading.Lock()
+        self.pending: dict[Hashable, Future[Any]] = {}
+
+
+class _SyncResolution:
+    __slots__ = (
+        "app_scope",
+        "bridge",
+        "cache",
+        "call_kwargs",
+        "exit_stack",
+        "hooks",
+        "shared_cache",
+        "siblings",
+        "watch",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        call_kwargs: dict[str, Any],
+        exit_stack: ExitStack,
+        app_scope: AppScope,
+        *,
+        cache: dict[Hashable, Any] | None = None,
+        hooks: Hooks = (),
+        bridge: AsyncBridge | None = None,
+        siblings: _ConcurrentSiblings | None = None,
+        watch: _LoopWatch | None = None,
+    ) -> None:
+        self.call_kwargs = call_kwargs
+        self.exit_stack = exit_stack
+        self.app_scope = app_scope
+        self.cache = {} if cache is None else cache
+        # Caches that outlive the call are shared by calls with other arguments
+        self.shared_cache = cache is not None
+        self.hooks = hooks
+        self.bridge = bridge
+        self.siblings = siblings
+        self.watch = watch
+
+
+def _cache_key(
+    node: DependencyNode,
+    resolution: "_SyncResolution | _AsyncResolution",
+) -> Hashable:
+    if not resolution.shared_cache:
+        return node.key
+    call_kwargs = resolution.call_kwargs
+    arguments = tuple(
+        (name, call_kwargs[name]) for name in node.names if name in call_kwargs
+    )
+    if not arguments:
+        return node.key
+    try:
+        hash(arguments)
+    except TypeError:
+        # Unhashable arguments can't be matched, so the value isn't shared
+        # with other calls, only within this one
+        return node.key, resolution
+    return node.key, arguments
+
+
+def _resolve_app_scoped_sync(
+    node: DependencyNode,
+    app_scope: AppScope,
+    hooks: Hooks = (),
+) -> Any:  # noqa: ANN401
+    values = app_scope.values
+    if node.call not in values:
+        with app_scope.lock:
+            if node.call not in values:
+                values[node.call] = _resolve_dependency_sync(
+                    node,
+                    _SyncResolution({}, app_scope.exit_stack, app_scope, hooks=hooks),
+                )
+                return values[node.call]
+    if hooks:
+        _emit_cache_hit(hooks, node, in_async=False)
+    return values[node.call]
+
+
+def _resolve_sub_dependency_sync(
+    edge: DependencyEdge,
+    resolution: _SyncResolution,
+) -> Any:  # noqa: ANN401
+    sub_node = cast(DependencyNode, edge.node)
+    if edge.scope == "app":
+        return _resolve_app_scoped_sync(
+            sub_node,
+            resolution.app_scope,
+            resolution.hooks,
+        )
+    cache = resolution.cache
+    key = _cache_key(sub_node, resolution)
+    if edge.use_cache and key in cache:
+        if resolution.hooks:
+            _emit_cache_hit(resolution.hooks, sub_node, in_async=False)
+        return cache[key]
+    value = _resolve_dependency_sync(sub_node, resolution)
+    cache.setdefault(key, value)
+    return value
+
+
+def _get_lazy_sync(edge: DependencyEdge, resolution: _SyncResolution) -> Lazy[Any]:
+    # Resolving on first use registers any teardown with the call's exit stack
+    return Lazy(functools.partial(_resolve_sub_dependency_sync, edge, resolution))
+
+
+def _resolve_shared_sub_dependency_sync(
+    edge: DependencyEdge,
+    resolution: _SyncResolution,
+    siblings: _ConcurrentSiblings,
+) -> Any:  # noqa: ANN401
+    sub_node = cast(DependencyNode, edge.node)
+    if edge.scope == "app" or not edge.use_cache:
+        return _resolve_sub_dependency_sync(edge, resolution)
+    cache = resolution.cache
+    key = _cache_key(sub_node, resolution)
+    with siblings.lock:
+        if key in cache:
+            if resolution.hooks:
+                _emit_cache_hit(resolution.hooks, sub_node, in_async=False)
+            return cache[key]
+        shared = siblings.pending.get(key)
+        owner = shared is None
+        if shared is None:
+            shared = siblings.pending[key] = Future()
+    if not owner:
+        # Another thread is already resolving it, so wait instead of calling twice
+        return shared.result()
+    try:
+        value = _resolve_dependency_sync(sub_node, resolution)
+    except BaseException as error:
+        with siblings.lock:
+            del siblings.pending[key]
+        shared.set_exception(error)
+        raise
+    with siblings.lock:
+        cache.setdefault(key, value)
+        del siblings.pending[key]
+    shared.set_result(value)
+    return value
+
+
+def _resolve_kwargs_concurrently(
+    node: DependencyNode,
+    resolution: _SyncResolution,
+    siblings: _ConcurrentSiblings,
 ) -> dict[str, Any]:
-    call_kwargs = {}
-    i = 0
-    for param in inspect.signature(func).parameters.values():
-        if i < len(args):
-            call_kwargs[param.name] = args[i]
-            i += 1
-        elif param.name in kwargs:
-            call_kwargs[param.name] = kwargs[param.name]
-        elif isinstance(param.default, Depends):
-            continue
-        elif param.default != inspect.Parameter.empty:
-            call_kwargs[param.name] = param.default
-    return call_kwargs
-
-
-def _sub_dependencies(
-    dependency: Dependency,
-    app_instance: FastAPI,
-) -> Iterator[DependencyInfo]:
-    for param in inspect.signature(dependency).parameters.values():
-        if not isinstance(param.default, Depends):
-            yield DependencyInfo(param.name, None)
-            continue
-        if param.default.dependency is None:
-            error_msg = (
-                "Depends instance must have a dependency. "
-                "Please add a dependency or use a type annotation"
-            )
-            raise ValueError(error_msg)
-        yield DependencyInfo(
-            param.name,
-            app_instance.dependency_overrides.get(
-                param.default.dependency,
-                param.default.dependency,
-            ),
+    call_kwargs = resolution.call_kwargs
+    kwargs = {}
+    pending = []
+    for edge in node.edges:
+        if edge.name in call_kwargs:
+            kwargs[edge.name] = call_kwargs[edge.name]
+        elif edge.lazy:
+            kwargs[edge.name] = _get_lazy_sync(edge, resolution)
+        elif edge.node is not None:
+            pending.append(edge)
+
+    futures = []
+    inline = pending[-1:]
+    for edge in pending[:-1]:
+        future = siblings.pool.try_submit(
+            _resolve_shared_sub_dependency_sync,
+            edge,
+            resolution,
+            siblings,
         )
+        if future is None:
+            inline.append(edge)
+        else:
+            futures.append((edge.name, future))
+    try:
+        for edge in inline:
+            kwargs[edge.name] = _resolve_shared_sub_dependency_sync(
+                edge,
+                resolution,
+                siblings,
+            )
+    finally:
+        # Nothing may still be entering the exit stack once this level returns
+        wait([future for _, future in futures])
+    kwargs.update((name, future.result()) for name, future in futures)
+    return kwargs
 
 
-def _resolve_sub_dependency_sync(
-    sub_dependency: DependencyInfo,
-    call_kwargs: dict[str, T],
-    app_instance: FastAPI,
-    exit_stack: ExitStack,
-) -> T | None:
-    if sub_dependency.name in call_kwargs:
-        return call_kwargs[sub_dependency.name]
-    if sub_dependency.dependency is not None:
-        return _resolve_dependency_sync(
-            cast(SyncDependency, sub_dependency.dependency),
-            call_kwargs,
-            app_instance,
+def _resolve_kwargs_sync(
+    node: DependencyNode,
+    resolution: _SyncResolution,
+) -> dict[str, Any]:
+    if resolution.siblings is not None:
+        return _resolve_kwargs_concurrently(node, resolution, resolution.siblings)
+    call_kwargs = resolution.call_kwargs
+    kwargs = {}
+    for edge in node.edges:
+        if edge.name in call_kwargs:
+            kwargs[edge.name] = call_kwargs[edge.name]
+        elif edge.lazy:
+            kwargs[edge.name] = _get_lazy_sync(edge, resolution)
+        elif edge.node is not None:
+            kwargs[edge.name] = _resolve_sub_dependency_sync(edge, resolution)
+    return kwargs
+
+
+def _invoke_node_sync(
+    node: DependencyNode,
+    kwargs: dict[str, Any],
+    resolution: _SyncResolution,
+    exit_stack: SyncContextStack,
+) -> Any:  # noqa: ANN401
+    if resolution.hooks:
+        return _call_instrumented_sync(
+            node,
             exit_stack,
+            kwargs,
+            resolution.hooks,
+            resolution.bridge,
         )
-    return None
+    return _call_dependency_sync(
+        node.call,
+        exit_stack,
+        kwargs,
+        node.kind,
+        resolution.bridge,
+    )
 
 
-def _resolve_dependency_sync(
-    dependency: SyncDependency[T],
-    call_kwargs: dict[str, Any],
-    app_instance: FastAPI,
-    exit_stack: ExitStack,
-) -> T:
-    kwargs = {}
-    for sub_dependency in _sub_dependencies(dependency, app_instance):
-        resolved = _resolve_sub_dependency_sync(
-            sub_dependency=sub_dependency,
-            call_kwargs=call_kwargs,
-            app_instance=app_instance,
-            exit_stack=exit_stack,
+def _call_node_sync(
+    node: DependencyNode,
+    kwargs: dict[str, Any],
+    resolution: _SyncResolution,
+) -> Any:  # noqa: ANN401
+    watch = resolution.watch
+    if watch is not None:
+        exit_stack: SyncContextStack = resolution.exit_stack
+        if node.kind.is_generator:
+            # Teardown is measured per dependency, as it runs on the loop too
+            exit_stack = watch.watch_teardown(node, exit_stack)
+        return watch.call_sync(
+            node,
+            functools.partial(_invoke_node_sync, node, kwargs, resolution, exit_stack),
         )
-        if resolved is not None:
-            kwargs[sub_dependency.name] = resolved
+    return _invoke_node_sync(node, kwargs, resolution, resolution.exit_stack)
+
 
-    return _call_dependency_sync(dependency, exit_stack, kwargs)
+def _resolve_dependency_sync(
+    node: DependencyNode,
+    resolution: _SyncResolution,
+) -> Any:  # noqa: ANN401
+    kwargs = _resolve_kwargs_sync(node, resolution)
+    if node.memo is not None:
+        return node.memo.call_sync(
+            node.call,
+            kwargs,
+            functools.partial(_call_node_sync, node, kwargs, resolution),
+        )
+    return _call_node_sync(node, kwargs, resolution)
 
 
 # TODO: Add check for positional only parameters
 def _get_sync_wrapper(
     func: Callable[P, T],
+    *,
+    defer_teardown: bool = False,
+    bridge_async: bool = False,
+    concurrency: int | None = None,
+    codegen: bool = False,
 ) -> Callable[P, T]:
+    plan = _get_plan(func)
+    pool = None if concurrency is None else SiblingPool(concurrency)
+    generated: _GeneratedResolver | None = None
 
     @functools.wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        exit_stack = ExitStack()
-        app_instance = _get_app_instance()
-        call_kwargs = _get_call_kwargs(func, *args, **kwargs)
-
-        return _resolve_dependency_sync(
-            dependency=func,
-            call_kwargs=call_kwargs,
-            app_instance=app_instance,
-            exit_stack=exit_stack,
-        )
+        nonlocal generated
+        root = plan.root(_get_app_instance())
+        call_kwargs = plan.binding.bind(args, kwargs)
+
+        context = _get_endpoint_context()
+        watch = _watch_loop(_get_blocking_monitor(), in_async=False)
+        resolve = None
+        if (
+            codegen
+            and pool is None
+            and context is None
+            and watch is None
+            and not _get_hooks()
+        ):
+            if generated is None or generated.root is not root:
+                # Plans are recompiled when overrides change, and so is the code
+                generated = _GeneratedResolver(root)
+            if call_kwargs.keys() == generated.names:
+                resolve = generated.resolve
+        with ExitStack() as exit_stack:
+            if resolve is not None:
+                result = resolve(call_kwargs, exit_stack)
+            else:
+                result = _resolve_dependency_sync(
+                    root,
+                    _SyncResolution(
+                        call_kwargs,
+                        exit_stack,
+                        _get_app_scope(),
+                        cache=None if context is None else context.sync_cache,
+                        hooks=_get_hooks(),
+                        bridge=_get_async_bridge() if bridge_async else None,
+                        siblings=None if pool is None else _ConcurrentSiblings(pool),
+                        watch=watch,
+                    ),
+                )
+            if context is not None:
+                # Results are shared with other injected calls in the request,
+                # so teardown has to wait for the request to finish too
+                context.push_sync_teardown(exit_stack.pop_all())
+            elif defer_teardown:
+                _defer_teardown_sync(exit_stack.pop_all(), call_kwargs)
+        return result
 
     return wrapper
 
 
-async def _resolve_sub_dependency_async(
-    sub_dependency: DependencyInfo,
-    call_kwargs: dict[str, T],
-    app_instance: FastAPI,
-    async_exit_stack: AsyncExitStack,
-) -> T | None:
-    if sub_dependency.name in call_kwargs:
-        return call_kwargs[sub_dependency.name]
-    if sub_dependency.dependency is not None:
-        return await _resolve_dependency_async(
-            cast(AsyncDependency, sub_dependency.dependency),
-            call_kwargs,
-            app_instance,
-            async_exit_stack,
+class _AbandonedError(Exception):
+    pass
+
+
+class _SharedResult:
+    __slots__ = ("_done", "_error", "_value")
+
+    def __init__(self) -> None:
+        self._done = anyio.Event()
+        self._error: BaseException | None = None
+        self._value: Any = None
+
+    def set_value(self, value: Any) -> None:  # noqa: ANN401
+        self._value = value
+        self._done.set()
+
+    def set_error(self, error: BaseException) -> None:
+        if isinstance(error, anyio.get_cancelled_exc_class()):
+            # The cancellation belongs to the owner's scope, such as a timed
+            # out dependency, so waiters outside of it resolve the value again
+            error = _AbandonedError()
+        self._error = error
+        self._done.set()
+
+    async def get(self) -> Any:  # noqa: ANN401
+        await self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class _AsyncResolution:
+    __slots__ = (
+        "app_scope",
+        "cache",
+        "call_kwargs",
+        "exit_stack",
+        "hooks",
+        "keep_errors",
+        "limiter",
+        "shared_cache",
+        "watch",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        call_kwargs: dict[str, Any],
+        exit_stack: AsyncTeardownStack,
+        app_scope: AppScope,
+        *,
+        cache: dict[Hashable, _SharedResult] | None = None,
+        hooks: Hooks = (),
+        limiter: CapacityLimiter | None = None,
+        watch: _LoopWatch | None = None,
+        keep_errors: bool = False,
+    ) -> None:
+        self.call_kwargs = call_kwargs
+        self.exit_stack = exit_stack
+        self.app_scope = app_scope
+        self.cache = {} if cache is None else cache
+        self.shared_cache = cache is not None
+        self.hooks = hooks
+        self.limiter = limiter
+        self.watch = watch
+        # Failed results stay cached, so later lookups raise the same error
+        # instead of calling the dependency again
+        self.keep_errors = keep_errors
+
+
+def _keeps_error(resolution: _AsyncResolution, error: BaseException) -> bool:
+    # Cancellations are never kept, as waiters resolve those again
+    return resolution.keep_errors and isinstance(error, Exception)
+
+
+async def _resolve_app_scoped_async(
+    node: DependencyNode,
+    app_scope: AppScope,
+    hooks: Hooks = (),
+) -> Any:  # noqa: ANN401
+    values = app_scope.values
+    if node.call in values:
+        if hooks:
+            _emit_cache_hit(hooks, node, in_async=True)
+        return values[node.call]
+    shared = app_scope.pending.get(node.call)
+    if shared is not None:
+        if hooks:
+            _emit_cache_hit(hooks, node, in_async=True)
+        try:
+            return await shared.get()
+        except _AbandonedError:
+            return await _resolve_app_scoped_async(node, app_scope, hooks)
+    shared = app_scope.pending[node.call] = _SharedResult()
+    try:
+        value = await _resolve_dependency_async(
+            node,
+            _AsyncResolution({}, app_scope.async_exit_stack, app_scope, hooks=hooks),
         )
-    return None
+    except BaseException as error:
+        shared.set_error(error)
+        raise
+    finally:
+        del app_scope.pending[node.call]
+    values[node.call] = value
+    shared.set_value(value)
+    return value
 
 
-async def _resolve_dependency_async(
-    dependency: AsyncDependency[T],
-    call_kwargs: dict[str, Any],
-    app_instance: FastAPI,
-    async_exit_stack: AsyncExitStack,
+async def _warm_up(app_instance: OverridesProvider) -> None:
+    app_scope = _get_app_scope()
+    hooks = _get_hooks()
+    for node in _validate_injected(app_instance):
+        await _resolve_app_scoped_async(node, app_scope, hooks)
+
+
+async def _get_app_scoped_async(dependency: Dependency) -> Any:  # noqa: ANN401
+    app_instance = _get_app_instance()
+    dependency = _get_override(app_instance, dependency)
+    return await _resolve_app_scoped_async(
+        _get_plan(dependency).root(app_instance),
+        _get_app_scope(),
+        _get_hooks(),
+    )
+
+
+async def _with_timeout(
+    edge: DependencyEdge,
+    awaitable: Awaitable[T],
 ) -> T:
-    async with asyncer.create_task_group() as tg:
-        soon_kwargs = {}
-        for sub_dependency in _sub_dependencies(dependency, app_instance):
-            soon_kwargs[sub_dependency.name] = tg.soonify(
-                _resolve_sub_dependency_async,
-            )(
-                sub_dependency=sub_dependency,
-                call_kwargs=call_kwargs,
-                app_instance=app_instance,
-                async_exit_stack=async_exit_stack,
+    if edge.fallback is None:
+        with anyio.fail_after(edge.timeout):
+            return await awaitable
+    with anyio.move_on_after(edge.timeout):
+        return await awaitable
+    return edge.fallback()
+
+
+async def _resolve_edge_async(
+    edge: DependencyEdge,
+    resolution: _AsyncResolution,
+) -> Any:  # noqa: ANN401
+    node = cast(DependencyNode, edge.node)
+    if edge.timeout is None:
+        return await _resolve_dependency_async(node, resolution, resolution.limiter)
+    return await _with_timeout(
+        edge,
+        _resolve_dependency_async(node, resolution, resolution.limiter),
+    )
+
+
+async def _resolve_sub_dependency_async(
+    edge: DependencyEdge,
+    resolution: _AsyncResolution,
+) -> Any:  # noqa: ANN401
+    sub_node = cast(DependencyNode, edge.node)
+    if edge.scope == "app":
+        return await _resolve_app_scoped_async(
+            sub_node,
+            resolution.app_scope,
+            resolution.hooks,
+        )
+    cache = resolution.cache
+    key = _cache_key(sub_node, resolution)
+    shared = cache.get(key)
+    if shared is not None:
+        if edge.use_cache:
+            if resolution.hooks:
+                _emit_cache_hit(resolution.hooks, sub_node, in_async=True)
+            # Waits on an in-flight resolution instead of starting a duplicate call
+            return await _get_shared_async(edge, shared, resolution)
+        return await _resolve_edge_async(edge, resolution)
+    shared = cache[key] = _SharedResult()
+    try:
+        value = await _resolve_edge_async(edge, resolution)
+    except BaseException as error:
+        if not _keeps_error(resolution, error):
+            del cache[key]
+        shared.set_error(error)
+        raise
+    shared.set_value(value)
+    return value
+
+
+async def _get_shared_async(
+    edge: DependencyEdge,
+    shared: _SharedResult,
+    resolution: _AsyncResolution,
+) -> Any:  # noqa: ANN401
+    try:
+        return await shared.get()
+    except _AbandonedError:
+        return await _resolve_sub_dependency_async(edge, resolution)
+
+
+def _get_lazy_async(
+    edge: DependencyEdge,
+    resolution: _AsyncResolution,
+) -> AsyncLazy[Any]:
+    return AsyncLazy(functools.partial(_resolve_sub_dependency_async, edge, resolution))
+
+
+class _AsyncScheduler:
+    __slots__ = ("resolution", "task_group")
+
+    def __init__(self, resolution: _AsyncResolution, task_group: TaskGroup) -> None:
+        self.resolution = resolution
+        self.task_group = task_group
+
+    def schedule_kwargs(
+        self,
+        node: DependencyNode,
+    ) -> tuple[dict[str, Any], list[tuple[DependencyEdge, _SharedResult]]]:
+        call_kwargs = self.resolution.call_kwargs
+        kwargs = {}
+        pending = []
+        for edge in node.edges:
+            if edge.name in call_kwargs:
+                kwargs[edge.name] = call_kwargs[edge.name]
+            elif edge.lazy:
+                kwargs[edge.name] = _get_lazy_async(edge, self.resolution)
+            elif edge.node is not None:
+                pending.append((edge, self.schedule(edge)))
+        return kwargs, pending
+
+    def schedule(self, edge: DependencyEdge) -> _SharedResult:
+        resolution = self.resolution
+        sub_node = cast(DependencyNode, edge.node)
+        if edge.scope == "app":
+            shared = _SharedResult()
+            self.task_group.start_soon(self._run_app_scoped, sub_node, shared)
+            return shared
+        cache = resolution.cache
+        key = _cache_key(sub_node, resolution)
+        cached = cache.get(key)
+        if cached is not None and edge.use_cache:
+            if resolution.hooks:
+                _emit_cache_hit(resolution.hooks, sub_node, in_async=True)
+            return cached
+        shared = _SharedResult()
+        if cached is None:
+            cache[key] = shared
+        if edge.timeout is not None:
+            # Its whole subtree is resolved within the timeout, so that it is
+            # cancelled along with the dependency
+            resolve = functools.partial(_resolve_edge_async, edge, resolution)
+        else:
+            # The whole graph is scheduled up front, so every dependency starts
+            # as soon as its own inputs are ready rather than when its level is
+            kwargs, pending = self.schedule_kwargs(sub_node)
+            resolve = functools.partial(self._resolve, sub_node, kwargs, pending)
+        self.task_group.start_soon(self._run, sub_node, resolve, shared)
+        return shared
+
+    async def _resolve(
+        self,
+        node: DependencyNode,
+        kwargs: dict[str, Any],
+        pending: list[tuple[DependencyEdge, _SharedResult]],
+    ) -> Any:  # noqa: ANN401
+        resolution = self.resolution
+        for edge, dependency in pending:
+            kwargs[edge.name] = await _get_shared_async(edge, dependency, resolution)
+        return await _call_node_async(node, kwargs, resolution, resolution.limiter)
+
+    async def _run(
+        self,
+        node: DependencyNode,
+        resolve: Callable[[], Awaitable[Any]],
+        shared: _SharedResult,
+    ) -> None:
+        resolution = self.resolution
+        try:
+            value = await resolve()
+        except BaseException as error:
+            key = _cache_key(node, resolution)
+            if resolution.cache.get(key) is shared and not _keeps_error(
+                resolution,
+                error,
+            ):
+                del resolution.cache[key]
+            shared.set_error(error)
+            raise
+        shared.set_value(value)
+
+    async def _run_app_scoped(
+        self,
+        node: DependencyNode,
+        shared: _SharedResult,
+    ) -> None:
+        resolution = self.resolution
+        try:
+            value = await _resolve_app_scoped_async(
+                node,
+                resolution.app_scope,
+                resolution.hooks,
             )
-    kwargs = {
-        name: soon_kwarg.value
-        for name, soon_kwarg in soon_kwargs.items()
-        if soon_kwarg.value is not None
-    }
+        except BaseException as error:
+            shared.set_error(error)
+            raise
+        shared.set_value(value)
+
+
+def _flatten_errors(group: BaseExceptionGroup) -> list[BaseException]:
+    errors: list[BaseException] = []
+    for error in group.exceptions:
+        if isinstance(error, BaseExceptionGroup):
+            errors.extend(_flatten_errors(error))
+        elif not any(error is seen for seen in errors):
+            errors.append(error)
+    return errors
+
+
+async def _schedule_kwargs_async(
+    node: DependencyNode,
+    resolution: _AsyncResolution,
+) -> dict[str, Any]:
+    try:
+        async with anyio.create_task_group() as tg:
+            kwargs, pending = _AsyncScheduler(resolution, tg).schedule_kwargs(node)
+    except BaseExceptionGroup as group:
+        errors = _flatten_errors(group)
+        if len(errors) == 1:
+            # Dependants waiting on a failed dependency re-raise the same error
+            raise errors[0] from None
+        raise
+    for edge, dependency in pending:
+        kwargs[edge.name] = await _get_shared_async(edge, dependency, resolution)
+    return kwargs
+
+
+async def _resolve_kwargs_async(
+    node: DependencyNode,
+    resolution: _AsyncResolution,
+) -> dict[str, Any]:
+    if node.concurrent:
+        return await _schedule_kwargs_async(node, resolution)
+    call_kwargs = resolution.call_kwargs
+    kwargs = {}
+    for edge in node.edges:
+        if edge.name in call_kwargs:
+            kwargs[edge.name] = call_kwargs[edge.name]
+        elif edge.lazy:
+            kwargs[edge.name] = _get_lazy_async(edge, resolution)
+        elif edge.node is not None:
+            kwargs[edge.name] = await _resolve_sub_dependency_async(edge, resolution)
+    return kwargs
+
+
+async def _call_node_async(
+    node: DependencyNode,
+    kwargs: dict[str, Any],
+    resolution: _AsyncResolution,
+    limiter: CapacityLimiter | None = None,
+) -> Any:  # noqa: ANN401
+    if node.memo is not None:
+        # Memo hits return without waiting for the limiter
+        return await node.memo.call_async(
+            node.call,
+            kwargs,
+            functools.partial(_run_node_async, node, kwargs, resolution, limiter),
+        )
+    return await _run_node_async(node, kwargs, resolution, limiter)
+
+
+async def _run_node_async(
+    node: DependencyNode,
+    kwargs: dict[str, Any],
+    resolution: _AsyncResolution,
+    limiter: CapacityLimiter | None = None,
+) -> Any:  # noqa: ANN401
+    if limiter is not None and not _holding_limiter.get():
+        async with limiter:
+            token = _holding_limiter.set(True)
+            try:
+                return await _run_node_async(node, kwargs, resolution)
+            finally:
+                _holding_limiter.reset(token)
+    execution = node.execution
+    if execution == "process":
+        execution = resolution.app_scope.get_process_pool(_get_process_workers())
+    elif (
+        execution == "inline"
+        and resolution.watch is not None
+        and node.kind in (CallKind.SYNC, CallKind.SYNC_GENERATOR)
+    ):
+        return await resolution.watch.call_async(
+            node,
+            functools.partial(_invoke_node_async, node, kwargs, resolution, execution),
+        )
+    return await _invoke_node_async(node, kwargs, resolution, execution)
+
+
+async def _invoke_node_async(
+    node: DependencyNode,
+    kwargs: dict[str, Any],
+    resolution: _AsyncResolution,
+    execution: Execution,
+) -> Any:  # noqa: ANN401
+    if resolution.hooks:
+        return await _call_instrumented_async(
+            node,
+            resolution.exit_stack.layer(node.height),
+            kwargs,
+            resolution.hooks,
+            execution,
+        )
+    return await _call_dependency_async(
+        node.call,
+        resolution.exit_stack.layer(node.height),
+        kwargs,
+        node.kind,
+        execution,
+    )
+
 
-    return await _call_dependency_async(dependency, async_exit_stack, kwargs)
+async def _resolve_dependency_async(
+    node: DependencyNode,
+    resolution: _AsyncResolution,
+    limiter: CapacityLimiter | None = None,
+) -> Any:  # noqa: ANN401
+    kwargs = await _resolve_kwargs_async(node, resolution)
+    # Only dependencies hold the limiter, never the injected function itself
+    return await _call_node_async(node, kwargs, resolution, limiter)
 
 
 def _get_async_wrapper(
     func: Callable[P, Awaitable[T]],
+    *,
+    defer_teardown: bool = False,
+    deadline: float | None = None,
 ) -> Callable[P, Awaitable[T]]:
+    plan = _get_plan(func)
 
     @functools.wraps(func)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        async_exit_stack = AsyncExitStack()
-        app_instance = _get_app_instance()
-        call_kwargs = _get_call_kwargs(func, *args, **kwargs)
+        root = plan.root(_get_app_instance())
+        call_kwargs = plan.binding.bind(args, kwargs)
 
-        return await _resolve_dependency_async(
-            dependency=func,
-            call_kwargs=call_kwargs,
-            app_instance=app_instance,
-            async_exit_stack=async_exit_stack,
-        )
+        context = _get_endpoint_context()
+        async with AsyncTeardownStack() as exit_stack:
+            resolution = _AsyncResolution(
+                call_kwargs,
+                exit_stack,
+                _get_app_scope(),
+                cache=None if context is None else context.async_cache,
+                hooks=_get_hooks(),
+                limiter=_get_limiter(),
+                watch=_watch_loop(_get_blocking_monitor(), in_async=True),
+            )
+            if deadline is None:
+                result = await _resolve_dependency_async(root, resolution)
+            else:
+                # Teardown runs outside the deadline, so entered generator
+                # dependencies are still closed cleanly after a timeout
+                with anyio.fail_after(deadline):
+                    result = await _resolve_dependency_async(root, resolution)
+            if context is not None:
+                context.push_async_teardown(exit_stack.pop_all())
+            elif defer_teardown:
+                _defer_teardown_async(exit_stack.pop_all(), call_kwargs)
+        return result
 
     return wrapper
 
 
+def _get_sync_generator_wrapper(
+    func: Callable[P, Iterator[T]],
+    *,
+    bridge_async: bool = False,
+) -> Callable[P, Iterator[T]]:
+    plan = _get_plan(func)
+    stream_func: Callable[..., Iterator[T]] = func
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> Iterator[T]:
+        root = plan.root(_get_app_instance())
+        call_kwargs = plan.binding.bind(args, kwargs)
+
+        # Dependencies stay open for as long as the stream is being consumed
+        with ExitStack() as exit_stack:
+            dep_kwargs = _resolve_kwargs_sync(
+                root,
+                _SyncResolution(
+                    call_kwargs,
+                    exit_stack,
+                    _get_app_scope(),
+                    hooks=_get_hooks(),
+                    bridge=_get_async_bridge() if bridge_async else None,
+                ),
+            )
+            try:
+                yield from stream_func(**dep_kwargs)
+            except GeneratorExit:
+                # Closing a stream early is not an error for its dependencies
+                return
+
+    return wrapper
+
+
+def _get_async_generator_wrapper(
+    func: Callable[P, AsyncGenerator[T, None]],
+) -> Callable[P, AsyncIterator[T]]:
+    plan = _get_plan(func)
+    stream_func: Callable[..., AsyncGenerator[T, None]] = func
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[T]:
+        root = plan.root(_get_app_instance())
+        call_kwargs = plan.binding.bind(args, kwargs)
+
+        async with AsyncTeardownStack() as exit_stack:
+            dep_kwargs = await _resolve_kwargs_async(
+                root,
+                _AsyncResolution(
+                    call_kwargs,
+                    exit_stack,
+                    _get_app_scope(),
+                    hooks=_get_hooks(),
+                    limiter=_get_limiter(),
+                ),
+            )
+            async with aclosing(stream_func(**dep_kwargs)) as stream:
+                async for item in stream:
+                    try:
+                        yield item
+                    except GeneratorExit:
+                        return
+
+    return wrapper
+
+
+_SUPPORTED_OPTIONS = {
+    CallKind.SYNC: {"defer_teardown", "bridge_async", "concurrency", "codegen"},
+    CallKind.SYNC_GENERATOR: {"bridge_async"},
+    CallKind.ASYNC: {"defer_teardown", "deadline"},
+    CallKind.ASYNC_GENERATOR: set(),
+}
+
+
+def _check_options(func: Callable[..., Any], **options: bool) -> None:
+    if inspect.isasyncgenfunction(func):
+        kind = CallKind.ASYNC_GENERATOR
+    elif inspect.isgeneratorfunction(func):
+        kind = CallKind.SYNC_GENERATOR
+    elif inspect.iscoroutinefunction(func):
+        kind = CallKind.ASYNC
+    else:
+        kind = CallKind.SYNC
+    # Options that would be silently ignored, like a deadline that is never
+    # enforced, are rejected instead
+    unsupported = [
+        name
+        for name, given in options.items()
+        if given and name not in _SUPPORTED_OPTIONS[kind]
+    ]
+    if unsupported:
+        error_msg = (
+            f"{', '.join(unsupported)} can't be used with "
+            f"{kind.value.replace('_', ' ')} functions"
+        )
+        raise ValueError(error_msg)
+
+
 @overload
-def inject(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]: ...
+def inject(
+    func: Callable[P, Awaitable[T]],
+    *,
+    defer_teardown: bool = False,
+    bridge_async: bool = False,
+    concurrency: int | None = None,
+    deadline: float | None = None,
+    codegen: bool = False,
+) -> Callable[P, Awaitable[T]]: ...
 
 
 @overload
-def inject(func: Callable[P, T]) -> Callable[P, T]: ...
+def inject(
+    func: Callable[P, T],
+    *,
+    defer_teardown: bool = False,
+    bridge_async: bool = False,
+    concurrency: int | None = None,
+    deadline: float | None = None,
+    codegen: bool = False,
+) -> Callable[P, T]: ...
 
 
-def inject(func: Callable[P, T]) -> Callable[P, T] | Callable[P, Awaitable[T]]:
+@overload
+def inject(
+    func: None = None,
+    *,
+    defer_teardown: bool = False,
+    bridge_async: bool = False,
+    concurrency: int | None = None,
+    deadline: float | None = None,
+    codegen: bool = False,
+) -> Callable[[Callable[P, T]], Callable[P, T]]: ...
+
+
+def inject(  # noqa: PLR0913
+    func: Callable[P, T] | None = None,
+    *,
+    defer_teardown: bool = False,
+    bridge_async: bool = False,
+    concurrency: int | None = None,
+    deadline: float | None = None,
+    codegen: bool = False,
+) -> (
+    Callable[P, T]
+    | Callable[P, Awaitable[T]]
+    | Callable[[Callable[P, T]], Callable[P, T]]
+):
+    if func is None:
+
+        def decorator(func: Callable[P, T]) -> Callable[P, T]:
+            return inject(
+                func,
+                defer_teardown=defer_teardown,
+                bridge_async=bridge_async,
+                concurrency=concurrency,
+                deadline=deadline,
+                codegen=codegen,
+            )
+
+        return decorator
+    _check_options(
+        func,
+        defer_teardown=defer_teardown,
+        bridge_async=bridge_async,
+        concurrency=concurrency is not None,
+        deadline=deadline is not None,
+        codegen=codegen,
+    )
+    _register_injected(func, bridge_async=bridge_async)
+    if inspect.isasyncgenfunction(func):
+        return cast(Callable[P, T], _get_async_generator_wrapper(func))
+    if inspect.isgeneratorfunction(func):
+        return cast(
+            Callable[P, T],
+            _get_sync_generator_wrapper(func, bridge_async=bridge_async),
+        )
     if inspect.iscoroutinefunction(func):
-        return _get_async_wrapper(func)
-    return _get_sync_wrapper(func)
+        return _get_async_wrapper(
+            func,
+            defer_teardown=defer_teardown,
+            deadline=deadline,
+        )
+    return _get_sync_wrapper(
+        func,
+        defer_teardown=defer_teardown,
+        bridge_async=bridge_async,
+        concurrency=concurrency,
+        codegen=codegen,
+    )
+
+
+def _references(
+    node: DependencyNode,
+    names: set[str],
+    seen: set[DependencyNode],
+) -> bool:
+    if node in seen:
+        return False
+    seen.add(node)
+    return any(
+        edge.name in names
+        or (edge.node is not None and _references(edge.node, names, seen))
+        for edge in node.edges
+    )
+
+
+async def _prefetch_edge(edge: DependencyEdge, resolution: _AsyncResolution) -> None:
+    # Errors stay cached and are raised again when the handle is called
+    with suppress(Exception):
+        await _resolve_sub_dependency_async(edge, resolution)
+
+
+class PrefetchHandle(Generic[T]):
+    __slots__ = ("_binding", "_call_kwargs", "_resolution", "_root")
+
+    def __init__(
+        self,
+        root: DependencyNode,
+        binding: ParameterBinding,
+        call_kwargs: dict[str, Any],
+        resolution: _AsyncResolution,
+    ) -> None:
+        self._root = root
+        self._binding = binding
+        self._call_kwargs = call_kwargs
+        self._resolution = resolution
+
+    async def __call__(self, **kwargs: Any) -> T:  # noqa: ANN401
+        resolution = self._resolution
+        call_kwargs = self._binding.bind((), {**self._call_kwargs, **kwargs})
+        return await _resolve_dependency_async(
+            self._root,
+            _AsyncResolution(
+                call_kwargs,
+                resolution.exit_stack,
+                resolution.app_scope,
+                cache=resolution.cache,
+                hooks=resolution.hooks,
+                limiter=resolution.limiter,
+                keep_errors=True,
+            ),
+        )
+
+
+@asynccontextmanager
+async def prefetch(
+    func: Callable[..., Awaitable[T]],
+    /,
+    **kwargs: Any,  # noqa: ANN401
+) -> AsyncIterator[PrefetchHandle[T]]:
+    plan = _get_plan(func)
+    root = plan.root(_get_app_instance())
+    # Dependencies that read arguments which are only passed later can't start yet
+    unknown = {
+        edge.name
+        for edge in root.edges
+        if edge.node is None and edge.name not in kwargs
+    }
+    async with AsyncTeardownStack() as exit_stack:
+        resolution = _AsyncResolution(
+            plan.binding.bind((), kwargs),
+            exit_stack,
+            _get_app_scope(),
+            # The handle resolves with more arguments, so cached values are keyed
+            cache={},
+            hooks=_get_hooks(),
+            limiter=_get_limiter(),
+            keep_errors=True,
+        )
+        # The block runs outside of the task group, so its errors are raised
+        # as they are rather than wrapped in an exception group
+        task_group = anyio.create_task_group()
+        await task_group.__aenter__()
+        try:
+            for edge in root.edges:
+                if (
+                    edge.node is None
+                    or edge.name in kwargs
+                    or edge.lazy
+                    or not edge.use_cache
+                    or _references(edge.node, unknown, set())
+                ):
+                    continue
+                task_group.start_soon(_prefetch_edge, edge, resolution)
+            yield PrefetchHandle(root, plan.binding, kwargs, resolution)
+        finally:
+            # Prefetches that were never needed are cancelled before teardown
+            task_group.cancel_scope.cancel()
+            await task_group.__aexit__(None, None, None)
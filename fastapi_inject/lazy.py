@@ -0,0 +1,69 @@
+from collections.abc import Awaitable, Callable, Generator
+from typing import Any, Generic, TypeVar
+
+import anyio
+
+T = TypeVar("T")
+
+_UNRESOLVED: Any = object()
+
+
+class Lazy(Generic[T]):
+    __slots__ = ("_resolve", "_value")
+
+    def __init__(self, resolve: Callable[[], T]) -> None:
+        self._resolve = resolve
+        self._value: T = _UNRESOLVED
+
+    @property
+    def resolved(self) -> bool:
+        return self._value is not _UNRESOLVED
+
+    def __call__(self) -> T:
+        if self._value is _UNRESOLVED:
+            self._value = self._resolve()
+        return self._value
+
+    def __repr__(self) -> str:
+        state = "resolved" if self.resolved else "unresolved"
+        return f"<{self.__class__.__name__} {state}>"
+
+
+class AsyncLazy(Generic[T]):
+    __slots__ = ("_done", "_error", "_resolve", "_value")
+
+    def __init__(self, resolve: Callable[[], Awaitable[T]]) -> None:
+        self._resolve = resolve
+        self._value: T = _UNRESOLVED
+        self._error: BaseException | None = None
+        self._done: anyio.Event | None = None
+
+    @property
+    def resolved(self) -> bool:
+        return self._value is not _UNRESOLVED
+
+    async def __call__(self) -> T:
+        if self._value is not _UNRESOLVED:
+            return self._value
+        if self._done is not None:
+            # Concurrent awaits share the first resolution instead of repeating it
+            await self._done.wait()
+            if self._error is not None:
+                raise self._error
+            return self._value
+        self._done = anyio.Event()
+        try:
+            self._value = await self._resolve()
+        except BaseException as error:
+            self._error = error
+            raise
+        finally:
+            self._done.set()
+        return self._value
+
+    def __await__(self) -> Generator[Any, None, T]:
+        return self().__await__()
+
+    def __repr__(self) -> str:
+        state = "resolved" if self.resolved else "unresolved"
+        return f"<{self.__class__.__name__} {state}>"
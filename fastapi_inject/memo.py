@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+import anyio
+
+T = TypeVar("T")
+E = TypeVar("E", anyio.Event, threading.Event)
+
+_MISS: Any = object()
+
+_Key = tuple[Callable[..., Any], Hashable]
+
+
+def _make_key(
+    call: Callable[..., Any],
+    kwargs: dict[str, Any],
+) -> _Key | None:
+    # Overrides share the memo of the dependency they replace, but not its entries
+    key = (call, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class _Flight(Generic[E]):
+    __slots__ = ("done", "error", "value")
+
+    def __init__(self, done: E) -> None:
+        self.done: E = done
+        self.error: Exception | None = None
+        self.value: Any = _MISS
+
+
+class Memo:
+    def __init__(self, ttl: float | None = None, maxsize: int | None = 128) -> None:
+        if ttl is not None and ttl <= 0:
+            error_msg = "ttl must be positive"
+            raise ValueError(error_msg)
+        if maxsize is not None and maxsize < 1:
+            error_msg = "maxsize must be at least 1"
+            raise ValueError(error_msg)
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[_Key, tuple[float, Any]] = OrderedDict()
+        self._sync_flights: dict[_Key, _Flight[threading.Event]] = {}
+        self._async_flights: dict[_Key, _Flight[anyio.Event]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: _Key) -> Any:  # noqa: ANN401
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISS
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return _MISS
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: _Key, value: Any) -> None:  # noqa: ANN401
+        expires = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, **kwargs: Any) -> None:  # noqa: ANN401
+        arguments = tuple(sorted(kwargs.items()))
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == arguments]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def call_sync(
+        self,
+        call: Callable[..., Any],
+        kwargs: dict[str, Any],
+        compute: Callable[[], T],
+    ) -> T:
+        key = _make_key(call, kwargs)
+        if key is None:
+            return compute()
+        while True:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISS:
+                    return value
+                flight = self._sync_flights.get(key)
+                if flight is None:
+                    flight = self._sync_flights[key] = _Flight(threading.Event())
+                    break
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.value is not _MISS:
+                return flight.value
+            # The first caller was interrupted, so one of the waiters takes over
+        try:
+            value = compute()
+        except Exception as error:
+            flight.error = error
+            raise
+        else:
+            self._store(key, value)
+            flight.value = value
+        finally:
+            with self._lock:
+                del self._sync_flights[key]
+            flight.done.set()
+        return value
+
+    async def call_async(
+        self,
+        call: Callable[..., Any],
+        kwargs: dict[str, Any],
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        key = _make_key(call, kwargs)
+        if key is None:
+            return await compute()
+        while True:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISS:
+                    return value
+                flight = self._async_flights.get(key)
+                if flight is None:
+                    flight = self._async_flights[key] = _Flight(anyio.Event())
+                    break
+            # Concurrent misses wait for the first caller instead of repeating it
+            await flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.value is not _MISS:
+                return flight.value
+        try:
+            value = await compute()
+        except Exception as error:
+            flight.error = error
+            raise
+        else:
+            self._store(key, value)
+            flight.value = value
+        finally:
+            with self._lock:
+                del self._async_flights[key]
+            flight.done.set()
+        return value
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(ttl={self.ttl!r}, maxsize={self.maxsize!r})"
@@ -0,0 +1,127 @@
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Protocol, Self
+
+DependencyCallable = Callable[..., Any]
+
+
+class OverridesProvider(Protocol):
+    dependency_overrides: dict[DependencyCallable, DependencyCallable]
+
+
+class DependencyOverrides(dict[DependencyCallable, DependencyCallable]):
+    __slots__ = ("version",)
+
+    def __init__(
+        self,
+        overrides: Mapping[DependencyCallable, DependencyCallable] | None = None,
+    ) -> None:
+        super().__init__(overrides or {})
+        self.version = 0
+
+    def __setitem__(self, key: DependencyCallable, value: DependencyCallable) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: DependencyCallable) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(  # type: ignore[override,misc]
+        self,
+        other: Mapping[DependencyCallable, DependencyCallable],
+    ) -> Self:
+        super().__ior__(other)
+        self.version += 1
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def pop(  # type: ignore[override]
+        self,
+        key: DependencyCallable,
+        *default: DependencyCallable | None,
+    ) -> DependencyCallable | None:
+        value = super().pop(key, *default)
+        self.version += 1
+        return value
+
+    def popitem(self) -> tuple[DependencyCallable, DependencyCallable]:
+        item = super().popitem()
+        self.version += 1
+        return item
+
+    def setdefault(  # type: ignore[override]
+        self,
+        key: DependencyCallable,
+        default: DependencyCallable,
+    ) -> DependencyCallable:
+        value = super().setdefault(key, default)
+        self.version += 1
+        return value
+
+    def update(  # type: ignore[override]
+        self,
+        other: Mapping[DependencyCallable, DependencyCallable]
+        | Iterable[tuple[DependencyCallable, DependencyCallable]] = (),
+        /,
+    ) -> None:
+        super().update(other)
+        self.version += 1
+
+
+def _get_dependency_overrides(app: OverridesProvider) -> DependencyOverrides:
+    overrides = app.dependency_overrides
+    if not isinstance(overrides, DependencyOverrides):
+        # Replacing the mapping in place keeps FastAPI's own lookups working while
+        # letting compiled plans detect changes through the version counter.
+        overrides = DependencyOverrides(overrides)
+        app.dependency_overrides = overrides
+    return overrides
+
+
+class OverrideLayer:
+    __slots__ = ("__weakref__", "overrides")
+
+    def __init__(
+        self,
+        overrides: Mapping[DependencyCallable, DependencyCallable],
+    ) -> None:
+        self.overrides = overrides
+
+
+_override_layer: ContextVar[OverrideLayer | None] = ContextVar(
+    "fastapi_inject_override_layer",
+    default=None,
+)
+
+
+def _get_override_layer() -> OverrideLayer | None:
+    return _override_layer.get()
+
+
+def _get_override(
+    app: OverridesProvider,
+    dependency: DependencyCallable,
+) -> DependencyCallable:
+    layer = _override_layer.get()
+    if layer is not None and dependency in layer.overrides:
+        return layer.overrides[dependency]
+    return app.dependency_overrides.get(dependency, dependency)
+
+
+@contextmanager
+def override(
+    overrides: Mapping[DependencyCallable, DependencyCallable],
+) -> Iterator[None]:
+    parent = _override_layer.get()
+    # Nested layers are flattened up front so lookups stay a single dict access
+    merged = dict(overrides) if parent is None else {**parent.overrides, **overrides}
+    token = _override_layer.set(OverrideLayer(merged))
+    try:
+        yield
+    finally:
+        _override_layer.reset(token)
@@ -0,0 +1,55 @@
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from fastapi import params
+
+from fastapi_inject.memo import Memo
+from fastapi_inject.scopes import AppScopedDependency, Scope
+from fastapi_inject.utils import Execution, _get_call_kind
+
+_NO_FALLBACK: Any = object()
+
+
+def _return(value: Any) -> Any:  # noqa: ANN401
+    return value
+
+
+class Depends(params.Depends):
+    def __init__(  # noqa: PLR0913
+        self,
+        dependency: Callable[..., Any] | None = None,
+        *,
+        use_cache: bool = True,
+        scope: Scope = "call",
+        execution: Execution = "threadpool",
+        lazy: bool = False,
+        timeout: float | None = None,
+        fallback: Any = _NO_FALLBACK,  # noqa: ANN401
+        fallback_factory: Callable[[], Any] | None = None,
+        memo: Memo | None = None,
+    ) -> None:
+        if fallback is not _NO_FALLBACK:
+            if fallback_factory is not None:
+                error_msg = "Cannot set both fallback and fallback_factory"
+                raise ValueError(error_msg)
+            fallback_factory = partial(_return, fallback)
+        if fallback_factory is not None and timeout is None:
+            error_msg = "A fallback requires a timeout"
+            raise ValueError(error_msg)
+        if dependency is not None and _get_call_kind(dependency).is_generator:
+            if memo is not None:
+                error_msg = "Generator dependencies cannot be memoized"
+                raise ValueError(error_msg)
+            if execution == "process":
+                error_msg = "Generator dependencies cannot run in a process pool"
+                raise ValueError(error_msg)
+        if scope == "app" and dependency is not None:
+            dependency = AppScopedDependency(dependency)
+        super().__init__(dependency, use_cache=use_cache)
+        self.scope = scope
+        self.execution = execution
+        self.lazy = lazy
+        self.timeout = timeout
+        self.fallback_factory = fallback_factory
+        self.memo = memo
@@ -0,0 +1,342 @@
+import inspect
+from collections.abc import Callable, Hashable, Iterator
+from typing import Annotated, Any, NamedTuple, get_args, get_origin
+from weakref import WeakKeyDictionary
+
+from fastapi.dependencies.utils import get_typed_signature
+from fastapi.params import Depends, Security
+from fastapi.security import SecurityScopes
+from starlette.background import BackgroundTasks
+from starlette.requests import Request
+
+from fastapi_inject._exceptions import DependencyCycleError
+from fastapi_inject.context import (
+    _get_current_background_tasks,
+    _get_current_request,
+)
+from fastapi_inject.lazy import AsyncLazy, Lazy
+from fastapi_inject.memo import Memo
+from fastapi_inject.overrides import (
+    DependencyOverrides,
+    OverrideLayer,
+    OverridesProvider,
+    _get_dependency_overrides,
+    _get_override,
+    _get_override_layer,
+)
+from fastapi_inject.scopes import AppScopedDependency, Scope
+from fastapi_inject.utils import (
+    CallKind,
+    Dependency,
+    Execution,
+    _get_call_kind,
+    _get_name,
+)
+
+_NO_DEFAULT: Any = object()
+
+
+class DependencyInfo(NamedTuple):
+    name: str
+    dependency: Dependency | None
+    use_cache: bool = True
+    scope: Scope = "call"
+    execution: Execution = "threadpool"
+    lazy: bool = False
+    timeout: float | None = None
+    fallback: Callable[[], Any] | None = None
+    memo: Memo | None = None
+    scopes: tuple[str, ...] = ()
+
+
+def _get_depends(param: inspect.Parameter) -> Depends | None:
+    if isinstance(param.default, Depends):
+        return param.default
+    if get_origin(param.annotation) is Annotated:
+        # Like FastAPI, the last Depends in the metadata wins
+        for metadata in reversed(get_args(param.annotation)[1:]):
+            if isinstance(metadata, Depends):
+                return metadata
+    return None
+
+
+def _is_lazy_annotation(annotation: Any) -> bool:  # noqa: ANN401
+    if get_origin(annotation) is Annotated:
+        annotation = get_args(annotation)[0]
+    return (get_origin(annotation) or annotation) in (Lazy, AsyncLazy)
+
+
+class _SecurityScopesProvider:
+    __slots__ = ("scopes",)
+
+    def __init__(self, scopes: tuple[str, ...]) -> None:
+        self.scopes = scopes
+
+    def __call__(self) -> SecurityScopes:
+        return SecurityScopes(list(self.scopes))
+
+    def __repr__(self) -> str:
+        return f"SecurityScopes({list(self.scopes)!r})"
+
+
+def _get_request_provider(
+    annotation: Any,  # noqa: ANN401
+    scopes: tuple[str, ...] = (),
+) -> Dependency | None:
+    if get_origin(annotation) is Annotated:
+        annotation = get_args(annotation)[0]
+    if not isinstance(annotation, type):
+        return None
+    if issubclass(annotation, Request):
+        return _get_current_request
+    if issubclass(annotation, BackgroundTasks):
+        return _get_current_background_tasks
+    if issubclass(annotation, SecurityScopes):
+        return _SecurityScopesProvider(scopes)
+    return None
+
+
+def _sub_dependencies(
+    dependency: Dependency,
+    app_instance: OverridesProvider,
+    scopes: tuple[str, ...] = (),
+) -> Iterator[DependencyInfo]:
+    for param in get_typed_signature(dependency).parameters.values():
+        depends = _get_depends(param)
+        if depends is None:
+            # Request providers only read a contextvar, so never need a thread
+            yield DependencyInfo(
+                param.name,
+                _get_request_provider(param.annotation, scopes),
+                execution="inline",
+            )
+            continue
+        sub_dependency = depends.dependency
+        if sub_dependency is None:
+            error_msg = (
+                "Depends instance must have a dependency. "
+                "Please add a dependency or use a type annotation"
+            )
+            raise ValueError(error_msg)
+        scope: Scope = "call"
+        if isinstance(sub_dependency, AppScopedDependency):
+            sub_dependency = sub_dependency.dependency
+            scope = "app"
+        yield DependencyInfo(
+            param.name,
+            _get_override(app_instance, sub_dependency),
+            depends.use_cache,
+            scope,
+            getattr(depends, "execution", "threadpool"),
+            getattr(depends, "lazy", False) or _is_lazy_annotation(param.annotation),
+            getattr(depends, "timeout", None),
+            getattr(depends, "fallback_factory", None),
+            getattr(depends, "memo", None),
+            # Like FastAPI, scopes accumulate from the root down every path
+            (*scopes, *depends.scopes) if isinstance(depends, Security) else scopes,
+        )
+
+
+class ParameterBinding:
+    __slots__ = ("parameters",)
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.parameters = tuple(
+            (
+                param.name,
+                _NO_DEFAULT
+                if isinstance(param.default, Depends)
+                or param.default is inspect.Parameter.empty
+                else param.default,
+            )
+            for param in inspect.signature(func).parameters.values()
+        )
+
+    def bind(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        call_kwargs = {
+            name: arg for (name, _), arg in zip(self.parameters, args, strict=False)
+        }
+        for name, default in self.parameters[len(args) :]:
+            if name in kwargs:
+                call_kwargs[name] = kwargs[name]
+            elif default is not _NO_DEFAULT:
+                call_kwargs[name] = default
+        return call_kwargs
+
+
+class DependencyNode:
+    __slots__ = (
+        "call",
+        "concurrent",
+        "edges",
+        "execution",
+        "height",
+        "key",
+        "kind",
+        "memo",
+        "names",
+    )
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        call: Dependency,
+        kind: CallKind,
+        edges: tuple["DependencyEdge", ...],
+        execution: Execution = "threadpool",
+        memo: Memo | None = None,
+        scopes: tuple[str, ...] = (),
+    ) -> None:
+        self.call = call
+        self.kind = kind
+        self.edges = edges
+        self.execution = execution
+        self.memo = memo
+        self.height: int = max(
+            (edge.node.height + 1 for edge in edges if edge.node is not None),
+            default=0,
+        )
+        # Graphs without any fan-out are resolved in place, without the scheduler
+        sub_nodes = [
+            edge.node for edge in edges if edge.node is not None and not edge.lazy
+        ]
+        self.concurrent: bool = len(sub_nodes) > 1 or any(
+            sub_node.concurrent for sub_node in sub_nodes
+        )
+        # Any of these may be taken from the arguments of the injected call
+        names = {edge.name for edge in edges}
+        for edge in edges:
+            if edge.node is not None:
+                names.update(edge.node.names)
+        self.names: tuple[str, ...] = tuple(sorted(names))
+        # Values that read the security scopes of their path are cached per scopes
+        scoped = any(
+            edge.node is not None
+            and (
+                isinstance(edge.node.call, _SecurityScopesProvider)
+                or edge.node.key is not edge.node.call
+            )
+            for edge in edges
+        )
+        self.key: Hashable = (call, scopes) if scoped else call
+
+
+class DependencyEdge:
+    __slots__ = ("fallback", "lazy", "name", "node", "scope", "timeout", "use_cache")
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        name: str,
+        node: DependencyNode | None,
+        use_cache: bool = True,  # noqa: FBT001, FBT002
+        scope: Scope = "call",
+        lazy: bool = False,  # noqa: FBT001, FBT002
+        timeout: float | None = None,
+        fallback: Callable[[], Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.node = node
+        self.use_cache = use_cache
+        self.scope = scope
+        self.lazy = lazy
+        self.timeout = timeout
+        self.fallback = fallback
+
+
+NodeKey = tuple[Dependency, Execution, Memo | None, tuple[str, ...]]
+
+
+def _compile_node(  # noqa: PLR0913, PLR0917
+    dependency: Dependency,
+    app_instance: OverridesProvider,
+    nodes: dict[NodeKey, DependencyNode],
+    execution: Execution = "threadpool",
+    path: tuple[Dependency, ...] = (),
+    memo: Memo | None = None,
+    scopes: tuple[str, ...] = (),
+) -> DependencyNode:
+    node = nodes.get((dependency, execution, memo, scopes))
+    if node is not None:
+        return node
+    if dependency in path:
+        cycle = [*path[path.index(dependency) :], dependency]
+        raise DependencyCycleError([_get_name(call) for call in cycle])
+    path = (*path, dependency)
+    edges = tuple(
+        DependencyEdge(
+            sub_dependency.name,
+            None
+            if sub_dependency.dependency is None
+            else _compile_node(
+                sub_dependency.dependency,
+                app_instance,
+                nodes,
+                sub_dependency.execution,
+                path,
+                sub_dependency.memo,
+                sub_dependency.scopes,
+            ),
+            sub_dependency.use_cache,
+            sub_dependency.scope,
+            sub_dependency.lazy,
+            sub_dependency.timeout,
+            sub_dependency.fallback,
+        )
+        for sub_dependency in _sub_dependencies(dependency, app_instance, scopes)
+    )
+    node = DependencyNode(
+        dependency,
+        _get_call_kind(dependency),
+        edges,
+        execution,
+        memo,
+        scopes,
+    )
+    nodes[dependency, execution, memo, scopes] = node
+    return node
+
+
+CompiledRoot = tuple[DependencyOverrides, int, DependencyNode]
+
+
+class ResolutionPlan:
+    __slots__ = ("_compiled", "_layered", "binding", "func")
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.func = func
+        self.binding = ParameterBinding(func)
+        self._compiled: CompiledRoot | None = None
+        self._layered: WeakKeyDictionary[OverrideLayer, CompiledRoot] = (
+            WeakKeyDictionary()
+        )
+
+    def root(self, app_instance: OverridesProvider) -> DependencyNode:
+        overrides = _get_dependency_overrides(app_instance)
+        layer = _get_override_layer()
+        compiled = self._compiled if layer is None else self._layered.get(layer)
+        if (
+            compiled is not None
+            and compiled[0] is overrides
+            and compiled[1] == overrides.version
+        ):
+            return compiled[2]
+        version = overrides.version
+        root = _compile_node(self.func, app_instance, {})
+        if layer is None:
+            self._compiled = (overrides, version, root)
+        else:
+            self._layered[layer] = (overrides, version, root)
+        return root
+
+
+_plans: WeakKeyDictionary[Callable[..., Any], ResolutionPlan] = WeakKeyDictionary()
+
+
+def _get_plan(func: Callable[..., Any]) -> ResolutionPlan:
+    try:
+        plan = _plans.get(func)
+    except TypeError:
+        # Callables that cannot be weakly referenced are compiled on every call
+        return ResolutionPlan(func)
+    if plan is None:
+        plan = _plans[func] = ResolutionPlan(func)
+    return plan
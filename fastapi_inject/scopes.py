@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Literal
+
+import anyio.to_thread
+
+from fastapi_inject.teardown import AsyncTeardownStack
+from fastapi_inject.utils import Dependency
+
+Scope = Literal["call", "app"]
+
+
+class AppScope:
+    __slots__ = (
+        "async_exit_stack",
+        "exit_stack",
+        "lock",
+        "pending",
+        "process_pool",
+        "values",
+    )
+
+    def __init__(self) -> None:
+        self.values: dict[Dependency, Any] = {}
+        self.pending: dict[Dependency, Any] = {}
+        self.lock = threading.RLock()
+        self.exit_stack = ExitStack()
+        self.async_exit_stack = AsyncTeardownStack()
+        self.process_pool: ProcessPoolExecutor | None = None
+
+    def get_process_pool(self, max_workers: int | None = None) -> ProcessPoolExecutor:
+        if self.process_pool is None:
+            with self.lock:
+                if self.process_pool is None:
+                    self.process_pool = ProcessPoolExecutor(max_workers)
+        return self.process_pool
+
+    async def aclose(self) -> None:
+        try:
+            await self.async_exit_stack.aclose()
+        finally:
+            self.exit_stack.close()
+            self.values.clear()
+            if self.process_pool is not None:
+                # Waits for running work without blocking the event loop
+                await anyio.to_thread.run_sync(self.process_pool.shutdown)
+                self.process_pool = None
+
+
+class AppScopedDependency:
+    __slots__ = ("dependency",)
+
+    def __init__(self, dependency: Dependency) -> None:
+        self.dependency = dependency
+
+    async def __call__(self) -> Any:  # noqa: ANN401
+        # Lets FastAPI endpoints share the instance held by the app scope
+        from fastapi_inject.injection import _get_app_scoped_async  # noqa: PLC0415
+
+        return await _get_app_scoped_async(self.dependency)
+
+    def __repr__(self) -> str:
+        name = getattr(self.dependency, "__name__", type(self.dependency).__name__)
+        return f"{self.__class__.__name__}({name})"
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, ExitStack
+from types import TracebackType
+from typing import Any, Self, TypeVar
+
+import anyio
+from starlette.background import BackgroundTasks
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ExcInfo = tuple[type[BaseException] | None, BaseException | None, TracebackType | None]
+
+
+class _TeardownLayer:
+    __slots__ = ("contexts",)
+
+    def __init__(self) -> None:
+        self.contexts: list[AbstractAsyncContextManager[Any]] = []
+
+    async def enter_async_context(self, cm: AbstractAsyncContextManager[T]) -> T:
+        value = await cm.__aenter__()
+        self.contexts.append(cm)
+        return value
+
+
+class AsyncTeardownStack:
+    __slots__ = ("_layers",)
+
+    def __init__(self) -> None:
+        self._layers: dict[int, _TeardownLayer] = {}
+
+    def layer(self, height: int) -> _TeardownLayer:
+        # Contexts entered at the same graph height never depend on each other,
+        # so each layer is unwound concurrently, highest layer first.
+        layer = self._layers.get(height)
+        if layer is None:
+            layer = self._layers[height] = _TeardownLayer()
+        return layer
+
+    def pop_all(self) -> "AsyncTeardownStack":
+        new_stack = AsyncTeardownStack()
+        new_stack._layers, self._layers = self._layers, {}
+        return new_stack
+
+    async def aclose(self) -> None:
+        await self.__aexit__(None, None, None)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> bool:
+        exc_info: ExcInfo = (exc_type, exc, tb)
+        error = exc
+        while self._layers:
+            layer = self._layers.pop(max(self._layers))
+            try:
+                if await _unwind_layer(layer.contexts, exc_info):
+                    error = None
+                    exc_info = (None, None, None)
+            except BaseException as layer_error:  # noqa: BLE001
+                error = layer_error
+                exc_info = (type(error), error, error.__traceback__)
+        if error is not None and error is not exc:
+            raise error
+        # Like AsyncExitStack, a suppressed error is reported back to the caller
+        return exc is not None and error is None
+
+
+async def _unwind_layer(
+    contexts: list[AbstractAsyncContextManager[Any]],
+    exc_info: ExcInfo,
+) -> bool:
+    if len(contexts) == 1:
+        return bool(await contexts[0].__aexit__(*exc_info))
+    suppressed = False
+    errors: list[Exception] = []
+
+    async def exit_context(cm: AbstractAsyncContextManager[Any]) -> None:
+        nonlocal suppressed
+        # Errors are collected rather than raised, so one failing teardown
+        # doesn't cancel the others in its layer
+        try:
+            if await cm.__aexit__(*exc_info):
+                suppressed = True
+        except Exception as error:  # noqa: BLE001
+            errors.append(error)
+
+    async with anyio.create_task_group() as tg:
+        for cm in contexts:
+            tg.start_soon(exit_context, cm)
+    if len(errors) == 1:
+        raise errors[0]
+    if errors:
+        error_msg = "Multiple dependencies failed during teardown"
+        raise ExceptionGroup(error_msg, errors)
+    return suppressed
+
+
+_teardown_executor: ThreadPoolExecutor | None = None
+_teardown_tasks: set[asyncio.Task[None]] = set()
+
+
+def _find_background_tasks(call_kwargs: dict[str, Any]) -> BackgroundTasks | None:
+    for value in call_kwargs.values():
+        if isinstance(value, BackgroundTasks):
+            return value
+    return None
+
+
+def _log_teardown_error(future: Future[None] | asyncio.Task[None]) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Deferred teardown failed", exc_info=future.exception())
+
+
+def _defer_teardown_sync(exit_stack: ExitStack, call_kwargs: dict[str, Any]) -> None:
+    global _teardown_executor  # noqa: PLW0603
+    background_tasks = _find_background_tasks(call_kwargs)
+    if background_tasks is not None:
+        background_tasks.add_task(exit_stack.close)
+        return
+    if _teardown_executor is None:
+        _teardown_executor = ThreadPoolExecutor(
+            thread_name_prefix="fastapi-inject-teardown",
+        )
+    _teardown_executor.submit(exit_stack.close).add_done_callback(
+        _log_teardown_error,
+    )
+
+
+def _defer_teardown_async(
+    exit_stack: AsyncTeardownStack,
+    call_kwargs: dict[str, Any],
+) -> None:
+    background_tasks = _find_background_tasks(call_kwargs)
+    if background_tasks is not None:
+        background_tasks.add_task(exit_stack.aclose)
+        return
+    task = asyncio.get_running_loop().create_task(exit_stack.aclose())
+    _teardown_tasks.add(task)
+    task.add_done_callback(_teardown_tasks.discard)
+    task.add_done_callback(_log_teardown_error)
@@ -1,7 +1,18 @@
+import asyncio
+import enum
+import functools
 from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
-from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
-from typing import Any, TypeVar, cast
+from concurrent.futures import Executor
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    asynccontextmanager,
+    contextmanager,
+)
+from typing import Any, Literal, Protocol, TypeVar, cast
 
+import anyio.to_thread
+from anyio import CapacityLimiter
 from fastapi.concurrency import contextmanager_in_threadpool
 from fastapi.dependencies.utils import (
     is_async_gen_callable,
@@ -10,6 +21,8 @@ from fastapi.dependencies.utils import (
 )
 from starlette.concurrency import run_in_threadpool
 
+from fastapi_inject.bridge import AsyncBridge
+
 T = TypeVar("T")
 
 SyncCallable = Callable[..., T]
@@ -19,15 +32,49 @@ AsyncCallable = Callable[..., Awaitable[T]]
 AsyncGeneratorCallable = Callable[..., AsyncIterator[Awaitable[T]]]
 AsyncDependency = AsyncCallable[T] | AsyncGeneratorCallable[T]
 Dependency = SyncDependency[T] | AsyncDependency[T]
+Execution = Literal["inline", "threadpool", "process"] | CapacityLimiter | Executor
+
+
+class SyncContextStack(Protocol):
+    def enter_context(self, cm: AbstractContextManager[T]) -> T: ...
+
+
+class AsyncContextStack(Protocol):
+    async def enter_async_context(self, cm: AbstractAsyncContextManager[T]) -> T: ...
+
+
+class CallKind(enum.Enum):
+    SYNC = "sync"
+    SYNC_GENERATOR = "sync_generator"
+    ASYNC = "async"
+    ASYNC_GENERATOR = "async_generator"
+
+    @property
+    def is_generator(self) -> bool:
+        return self in (CallKind.SYNC_GENERATOR, CallKind.ASYNC_GENERATOR)
+
+
+def _get_name(dependency: Dependency) -> str:
+    return getattr(dependency, "__qualname__", None) or repr(dependency)
 
 
 def _is_async_dependency(dependency: Dependency) -> bool:
     return is_coroutine_callable(dependency) or is_async_gen_callable(dependency)
 
 
+def _get_call_kind(dependency: Dependency) -> CallKind:
+    if is_gen_callable(dependency):
+        return CallKind.SYNC_GENERATOR
+    if is_async_gen_callable(dependency):
+        return CallKind.ASYNC_GENERATOR
+    if is_coroutine_callable(dependency):
+        return CallKind.ASYNC
+    return CallKind.SYNC
+
+
 def _solve_sync_generator_sync_context(
     gen: SyncGeneratorCallable[T],
-    stack: ExitStack,
+    stack: SyncContextStack,
     gen_kwargs: dict[str, Any] | None = None,
 ) -> T:
     gen_kwargs = gen_kwargs or {}
@@ -35,19 +82,61 @@ def _solve_sync_generator_sync_context(
     return stack.enter_context(cm)
 
 
+async def _run_sync(
+    execution: Execution,
+    func: Callable[..., T],
+    *args: Any,  # noqa: ANN401
+) -> T:
+    if execution == "inline":
+        return func(*args)
+    if execution == "threadpool":
+        return await run_in_threadpool(func, *args)
+    if isinstance(execution, CapacityLimiter):
+        return await anyio.to_thread.run_sync(func, *args, limiter=execution)
+    # "process" is swapped for the app's process pool before dependencies are called
+    executor = cast(Executor, execution)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+@asynccontextmanager
+async def _contextmanager_with_execution(
+    cm: AbstractContextManager[T],
+    execution: Execution,
+) -> AsyncIterator[T]:
+    value = await _run_sync(execution, cm.__enter__)
+    try:
+        yield value
+    except Exception as error:
+        if not await _run_sync(
+            execution,
+            cm.__exit__,
+            type(error),
+            error,
+            error.__traceback__,
+        ):
+            raise
+    else:
+        await _run_sync(execution, cm.__exit__, None, None, None)
+
+
 async def _solve_sync_generator_async_context(
     gen: SyncGeneratorCallable[T],
-    stack: AsyncExitStack,
+    stack: AsyncContextStack,
     gen_kwargs: dict[str, Any] | None = None,
+    execution: Execution = "threadpool",
 ) -> T:
     gen_kwargs = gen_kwargs or {}
-    cm = contextmanager_in_threadpool(contextmanager(gen)(**gen_kwargs))
+    sync_cm = contextmanager(gen)(**gen_kwargs)
+    if execution == "threadpool":
+        cm = contextmanager_in_threadpool(sync_cm)
+    else:
+        cm = _contextmanager_with_execution(sync_cm, execution)
     return await stack.enter_async_context(cm)  # type: ignore[arg-type]
 
 
 async def _solve_async_generator_async_context(
     gen: AsyncGeneratorCallable[T],
-    stack: AsyncExitStack,
+    stack: AsyncContextStack,
     gen_kwargs: dict[str, Any] | None = None,
 ) -> T:
     gen_kwargs = gen_kwargs or {}
@@ -57,14 +146,26 @@ async def _solve_async_generator_async_context(
 
 def _call_dependency_sync(
     dependency: Dependency[T],
-    exit_stack: ExitStack,
+    exit_stack: SyncContextStack,
     dep_kwargs: dict[str, Any] | None = None,
+    kind: CallKind | None = None,
+    bridge: AsyncBridge | None = None,
 ) -> T:
     dep_kwargs = dep_kwargs or {}
-    if _is_async_dependency(dependency):
-        error_msg = "Cannot inject async dependency into sync function"
-        raise ValueError(error_msg)
-    if is_gen_callable(dependency):
+    kind = kind or _get_call_kind(dependency)
+    if kind in (CallKind.ASYNC, CallKind.ASYNC_GENERATOR):
+        if bridge is None:
+            error_msg = "Cannot inject async dependency into sync function"
+            raise ValueError(error_msg)
+        if kind is CallKind.ASYNC:
+            return bridge.call(
+                functools.partial(cast(AsyncCallable[T], dependency), **dep_kwargs),
+            )
+        cm = asynccontextmanager(cast(Callable[..., AsyncIterator[T]], dependency))(
+            **dep_kwargs,
+        )
+        return exit_stack.enter_context(bridge.wrap_async_context_manager(cm))
+    if kind is CallKind.SYNC_GENERATOR:
         return _solve_sync_generator_sync_context(
             gen=cast(SyncGeneratorCallable[T], dependency),
             stack=exit_stack,
@@ -75,22 +176,31 @@ def _call_dependency_sync(
 
 async def _call_dependency_async(
     dependency: Dependency[T],
-    async_exit_stack: AsyncExitStack,
+    async_exit_stack: AsyncContextStack,
     dep_kwargs: dict[str, Any] | None = None,
+    kind: CallKind | None = None,
+    execution: Execution = "threadpool",
 ) -> T:
     dep_kwargs = dep_kwargs or {}
-    if is_gen_callable(dependency):
+    kind = kind or _get_call_kind(dependency)
+    if kind is CallKind.SYNC_GENERATOR:
         return await _solve_sync_generator_async_context(
             gen=cast(SyncGeneratorCallable[T], dependency),
             stack=async_exit_stack,
             gen_kwargs=dep_kwargs,
+            execution=execution,
         )
-    if is_async_gen_callable(dependency):
+    if kind is CallKind.ASYNC_GENERATOR:
         return await _solve_async_generator_async_context(
             gen=cast(AsyncGeneratorCallable, dependency),
             stack=async_exit_stack,
             gen_kwargs=dep_kwargs,
         )
-    if is_coroutine_callable(dependency):
+    if kind is CallKind.ASYNC:
         return await cast(Awaitable[T], dependency(**dep_kwargs))
-    return await run_in_threadpool(cast(SyncCallable[T], dependency), **dep_kwargs)
+    if execution == "threadpool":
+        return await run_in_threadpool(cast(SyncCallable[T], dependency), **dep_kwargs)
+    return await _run_sync(
+        execution,
+        functools.partial(cast(SyncCallable[T], dependency), **dep_kwargs),
+    )
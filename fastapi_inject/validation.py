@@ -0,0 +1,69 @@
+from collections.abc import Callable, Iterator
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from fastapi_inject._exceptions import DependencyCycleError, InjectionValidationError
+from fastapi_inject.overrides import OverridesProvider
+from fastapi_inject.plan import DependencyNode, _get_plan
+from fastapi_inject.utils import CallKind, _get_call_kind, _get_name
+
+_injected: WeakKeyDictionary[Callable[..., Any], bool] = WeakKeyDictionary()
+
+
+def _register_injected(func: Callable[..., Any], *, bridge_async: bool) -> None:
+    try:
+        _injected[func] = bridge_async
+    except TypeError:
+        # Callables that cannot be weakly referenced are not validated up front
+        return
+
+
+def _walk(root: DependencyNode) -> Iterator[tuple[DependencyNode, bool]]:
+    seen = {id(root)}
+    stack = [(root, False)]
+    while stack:
+        node, app_scoped = stack.pop()
+        yield node, app_scoped
+        for edge in node.edges:
+            if edge.node is not None and id(edge.node) not in seen:
+                seen.add(id(edge.node))
+                stack.append((edge.node, app_scoped or edge.scope == "app"))
+
+
+def _is_sync_function(func: Callable[..., Any]) -> bool:
+    return _get_call_kind(func) in (CallKind.SYNC, CallKind.SYNC_GENERATOR)
+
+
+def _validate_injected(app_instance: OverridesProvider) -> list[DependencyNode]:
+    errors = []
+    app_scoped: dict[int, DependencyNode] = {}
+    for func, bridge_async in list(_injected.items()):
+        name = _get_name(func)
+        try:
+            root = _get_plan(func).root(app_instance)
+        except (DependencyCycleError, ValueError) as error:
+            errors.append(f"{name}: {error}")
+            continue
+        check_async = not bridge_async and _is_sync_function(func)
+        for node, in_app_scope in _walk(root):
+            for edge in node.edges:
+                # Only the dependency behind the edge is a singleton, its own
+                # sub-dependencies are resolved once along with it
+                if edge.scope == "app" and edge.node is not None:
+                    app_scoped.setdefault(id(edge.node), edge.node)
+            if (
+                not in_app_scope
+                and check_async
+                and node.kind
+                in (
+                    CallKind.ASYNC,
+                    CallKind.ASYNC_GENERATOR,
+                )
+            ):
+                errors.append(
+                    f"{name}: cannot inject async dependency "
+                    f"{_get_name(node.call)} into sync function",
+                )
+    if errors:
+        raise InjectionValidationError(errors)
+    return list(app_scoped.values())
@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator
+
 from fastapi import Depends
 
 from tests.code.dependencies import (
@@ -57,3 +59,11 @@ async def get_personalised_message_async(
     message: str = Depends(name_function),
 ) -> str:
     return message
+
+
+async def stream_messages(
+    message_1: str = Depends(async_generator),
+    message_2: str = Depends(sync_generator),
+) -> AsyncIterator[str]:
+    yield message_1
+    yield message_2
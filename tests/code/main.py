@@ -1,7 +1,8 @@
 from fastapi import APIRouter, FastAPI
+from fastapi.responses import StreamingResponse
 
 from fastapi_inject.injection import inject
-from tests.code.functions import get_message, get_message_async
+from tests.code.functions import get_message, get_message_async, stream_messages
 
 router = APIRouter()
 
@@ -16,6 +17,11 @@ async def root_async() -> dict[str, str]:
     return {"message": await inject(get_message_async)()}
 
 
+@router.get("/stream")
+async def root_stream() -> StreamingResponse:
+    return StreamingResponse(inject(stream_messages)())
+
+
 def get_app() -> FastAPI:
     app = FastAPI()
     app.include_router(router)
@@ -0,0 +1,160 @@
+import gc
+from collections.abc import AsyncIterator, Iterator
+
+import anyio
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import batch
+
+
+def test_sync_batch(enabled_app: FastAPI):
+    events = []
+
+    def get_session() -> Iterator[str]:
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    def process(item: int, session: str = Depends(get_session)) -> str:
+        return f"{session} {item}"
+
+    with batch(process) as bound:
+        assert bound(1) == "session 1"
+        assert list(bound.map([2, 3])) == ["session 2", "session 3"]
+        assert sorted(bound.map(range(10), concurrency=4)) == sorted(
+            f"session {i}" for i in range(10)
+        )
+        assert events == ["open"]
+    assert events == ["open", "close"]
+
+    with pytest.raises(RuntimeError):
+        bound(1)
+
+
+@pytest.mark.anyio()
+async def test_async_batch(enabled_app: FastAPI):
+    events = []
+
+    async def get_session() -> AsyncIterator[str]:
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    async def process(item: int, session: str = Depends(get_session)) -> str:
+        await anyio.sleep(0.1)
+        return f"{session} {item}"
+
+    async with batch(process) as bound:
+        assert await bound(1) == "session 1"
+        assert [result async for result in bound.map([2, 3])] == [
+            "session 2",
+            "session 3",
+        ]
+        with anyio.fail_after(0.5):
+            results = [result async for result in bound.map(range(10), concurrency=10)]
+        assert sorted(results) == sorted(f"session {i}" for i in range(10))
+        assert events == ["open"]
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_async_batch_map_early_break(enabled_app: FastAPI):
+    finished = []
+
+    async def process(item: int) -> int:
+        await anyio.sleep(0.01 * item)
+        finished.append(item)
+        return item
+
+    async with batch(process) as bound:
+        async for result in bound.map(range(10), concurrency=3):
+            assert result == 0
+            break
+        # The abandoned generator is finalized in another task
+        gc.collect()
+        await anyio.sleep(0.1)
+    assert len(finished) < 10
+
+    async with batch(process) as bound:
+        assert await bound(1) == 1
+
+
+@pytest.mark.anyio()
+async def test_async_batch_map_errors(enabled_app: FastAPI):
+    async def process(item: int) -> int:
+        if item == 2:
+            raise ValueError
+        return item
+
+    async with batch(process) as bound:
+        with pytest.raises(ValueError):  # noqa: PT011
+            async for _ in bound.map(range(5), concurrency=2):
+                pass
+        assert await bound(1) == 1
+
+
+def test_batch_shared_kwargs(enabled_app: FastAPI):
+    def get_greeting(name: str) -> str:
+        return f"Hello {name}"
+
+    def greet(
+        punctuation: str,
+        name: str,
+        greeting: str = Depends(get_greeting),
+    ) -> str:
+        return greeting + punctuation
+
+    with batch(greet, name="World") as bound:
+        assert list(bound.map(["!", "?"])) == ["Hello World!", "Hello World?"]
+
+
+def test_batch_binds_items_after_args(enabled_app: FastAPI):
+    events = []
+
+    def get_session() -> Iterator[str]:
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    def get_context(item: int, session: str = Depends(get_session)) -> str:
+        events.append(f"context {item}")
+        return f"{session} {item}"
+
+    def process(
+        prefix: str,
+        item: int,
+        session: str = Depends(get_session),
+        context: str = Depends(get_context),
+    ) -> str:
+        return f"{prefix} {context}"
+
+    with batch(process, "p") as bound:
+        assert bound(1) == "p session 1"
+        assert list(bound.map([2, 3])) == ["p session 2", "p session 3"]
+    assert events == ["open", "context 1", "context 2", "context 3", "close"]
+
+
+@pytest.mark.anyio()
+async def test_async_batch_binds_items_after_args(enabled_app: FastAPI):
+    events = []
+
+    async def get_context(item: int) -> AsyncIterator[str]:
+        events.append(f"open {item}")
+        yield f"context {item}"
+        events.append(f"close {item}")
+
+    async def process(
+        prefix: str,
+        item: int,
+        context: str = Depends(get_context),
+    ) -> str:
+        return f"{prefix} {context}"
+
+    async with batch(process, "p") as bound:
+        assert await bound(1) == "p context 1"
+        results = [result async for result in bound.map([2, 3], concurrency=2)]
+        assert sorted(results) == ["p context 2", "p context 3"]
+    assert sorted(events) == [
+        f"{action} {item}" for action in ("close", "open") for item in (1, 2, 3)
+    ]
@@ -0,0 +1,49 @@
+import pytest
+from fastapi import FastAPI
+
+from benchmarks.imports import check
+from benchmarks.load import LoadScenario, run_in_process
+from benchmarks.resolution import Scenario, compare, run_scenario
+
+
+def test_benchmark_scenarios_run(enabled_app: FastAPI):
+    results = [
+        run_scenario(Scenario(2, 2, mix), enabled_app, number=2, repeat=1)
+        for mix in ("sync", "mixed")
+    ]
+    results.append(
+        run_scenario(
+            Scenario(2, 2, "mixed", overrides=True),
+            enabled_app,
+            number=2,
+            repeat=1,
+        ),
+    )
+    assert [result.scenario for result in results] == [
+        "sync-d2-w2",
+        "mixed-d2-w2",
+        "mixed-d2-w2-overrides",
+    ]
+    assert all(result.inject_us > 0 for result in results)
+
+    report = {"results": [{"scenario": "sync-d2-w2", "inject_us": 1.0}]}
+    assert len(compare(report, report)) == 1
+
+
+def test_import_budgets():
+    assert check({"package": 1.0, "container": 1.0}) == []
+    assert check({"package": 1000.0, "container": 1.0}) == [
+        "package: 1000.0ms exceeds the 50ms budget",
+    ]
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize("wiring", ["native", "inject"])
+async def test_load_scenario_runs(non_enabled_app: FastAPI, wiring: str):
+    scenario = LoadScenario(2, 2, "mixed", wiring)  # type: ignore[arg-type]
+    result = await run_in_process(scenario, concurrency=4, requests=20)
+    assert result.scenario == f"mixed-d2-w2-{wiring}"
+    assert result.requests == 20
+    assert result.errors == 0
+    assert result.p99_ms >= result.p50_ms > 0
+    assert result.threadpool_peak is not None
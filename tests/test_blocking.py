@@ -0,0 +1,88 @@
+import time
+from collections.abc import Iterator
+
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import BlockingMonitor, enable_injection, inject
+from fastapi_inject import Depends as InjectDepends
+from fastapi_inject.plan import _get_plan
+
+
+def get_slow() -> str:
+    time.sleep(0.02)
+    return "slow"
+
+
+def get_fast() -> str:
+    return "fast"
+
+
+@pytest.mark.anyio()
+async def test_sync_call_on_loop_reported(non_enabled_app: FastAPI):
+    reported = []
+    monitor = BlockingMonitor(0.01, on_report=reported.append)
+    enable_injection(non_enabled_app, blocking_monitor=monitor)
+
+    def get_session() -> Iterator[str]:
+        yield "session"
+        time.sleep(0.02)
+
+    @inject
+    def func(
+        slow: str = Depends(get_slow),
+        fast: str = Depends(get_fast),
+        session: str = Depends(get_session),
+    ) -> str:
+        return slow
+
+    assert func() == "slow"
+    reports = list(monitor.reports)
+    assert [(report.dependency.__name__, report.phase) for report in reports] == [
+        ("get_slow", "resolve"),
+        ("get_session", "teardown"),
+    ]
+    assert __file__ in reports[0].call_site
+    assert "test_sync_call_on_loop_reported" in reports[0].call_site
+    assert reported == reports
+
+
+def test_sync_call_off_loop_not_reported(non_enabled_app: FastAPI):
+    monitor = BlockingMonitor(0.01)
+    enable_injection(non_enabled_app, blocking_monitor=monitor)
+
+    @inject
+    def func(slow: str = Depends(get_slow)) -> str:
+        return slow
+
+    assert func() == "slow"
+    assert not monitor.reports
+
+
+@pytest.mark.anyio()
+async def test_inline_dependency_offloaded(non_enabled_app: FastAPI):
+    monitor = BlockingMonitor(0.01, offload=True, on_report=[].append)
+    enable_injection(non_enabled_app, blocking_monitor=monitor)
+
+    async def func(
+        slow: str = InjectDepends(get_slow, execution="inline"),
+        fast: str = InjectDepends(get_fast, execution="inline"),
+    ) -> str:
+        return slow
+
+    injected = inject(func)
+    assert await injected() == "slow"
+    (report,) = monitor.reports
+    assert report.dependency is get_slow
+    assert report.offloaded
+    root = _get_plan(func).root(non_enabled_app)
+    assert [edge.node.execution for edge in root.edges] == ["threadpool", "inline"]  # type: ignore[union-attr]
+
+    assert await injected() == "slow"
+    assert len(monitor.reports) == 1
+
+
+def test_sample_rate():
+    with pytest.raises(ValueError, match="sample_rate"):
+        BlockingMonitor(sample_rate=0)
+    assert BlockingMonitor(sample_rate=1).sample()
@@ -0,0 +1,56 @@
+import threading
+from collections.abc import AsyncIterator
+
+import anyio.to_thread
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import inject
+from tests.code.dependencies import MESSAGE, async_function
+
+
+def test_bridge_without_event_loop(enabled_app: FastAPI):
+    threads = []
+
+    async def get_resource() -> AsyncIterator[str]:
+        threads.append(threading.get_ident())
+        yield "resource"
+        threads.append(threading.get_ident())
+
+    @inject(bridge_async=True)
+    def func(
+        message: str = Depends(async_function),
+        resource: str = Depends(get_resource),
+    ) -> list[str]:
+        return [message, resource]
+
+    assert func() == [MESSAGE, "resource"]
+    assert len(threads) == 2
+    assert threads[0] == threads[1] != threading.get_ident()
+
+
+@pytest.mark.anyio()
+async def test_bridge_from_worker_thread(enabled_app: FastAPI):
+    threads = []
+
+    async def get_resource() -> AsyncIterator[str]:
+        threads.append(threading.get_ident())
+        yield "resource"
+        threads.append(threading.get_ident())
+
+    @inject(bridge_async=True)
+    def func(resource: str = Depends(get_resource)) -> str:
+        return resource
+
+    assert await anyio.to_thread.run_sync(func) == "resource"
+    assert threads == [threading.get_ident()] * 2
+
+
+@pytest.mark.anyio()
+async def test_bridge_on_event_loop(enabled_app: FastAPI):
+    @inject(bridge_async=True)
+    def func(message: str = Depends(async_function)) -> str:
+        return message  # pragma: no cover
+
+    with pytest.raises(RuntimeError, match="would block the loop"):
+        func()
@@ -0,0 +1,114 @@
+from collections.abc import Iterator
+
+from fastapi import BackgroundTasks, Depends, FastAPI
+
+from fastapi_inject import Depends as InjectDepends
+from fastapi_inject import Lazy, Memo, inject
+from fastapi_inject.codegen import _GeneratedResolver
+from fastapi_inject.plan import _get_plan
+
+
+def test_codegen_matches_generic_resolution(enabled_app: FastAPI):
+    events = []
+
+    def get_settings(prefix: str) -> str:
+        events.append("settings")
+        return prefix
+
+    def get_session(settings: str = Depends(get_settings)) -> Iterator[str]:
+        events.append("open")
+        yield f"{settings}-session"
+        events.append("close")
+
+    def get_repo(
+        session: str = Depends(get_session),
+        settings: str = Depends(get_settings),
+    ) -> str:
+        return f"{session}-{settings}"
+
+    def get_nonce(settings: str = Depends(get_settings, use_cache=False)) -> str:
+        return settings
+
+    def func(
+        prefix: str,
+        repo: str = Depends(get_repo),
+        nonce: str = Depends(get_nonce),
+    ) -> str:
+        events.append("call")
+        return f"{repo}/{nonce}"
+
+    generated = inject(codegen=True)(func)
+    generic = inject(func)
+
+    assert generated("a") == generic("a") == "a-session-a/a"
+    assert events == ["settings", "open", "settings", "call", "close"] * 2
+
+
+def test_codegen_defer_teardown(enabled_app: FastAPI):
+    events = []
+
+    def get_session() -> Iterator[str]:
+        yield "session"
+        events.append("close")
+
+    @inject(codegen=True, defer_teardown=True)
+    def func(
+        background_tasks: BackgroundTasks,
+        session: str = Depends(get_session),
+    ) -> str:
+        return session
+
+    background_tasks = BackgroundTasks()
+    assert func(background_tasks) == "session"
+    assert not events
+    assert len(background_tasks.tasks) == 1
+
+
+def test_codegen_regenerates_on_overrides(enabled_app: FastAPI):
+    def get_message() -> str:
+        return "Hello World!"
+
+    @inject(codegen=True)
+    def func(message: str = Depends(get_message)) -> str:
+        return message
+
+    assert func() == "Hello World!"
+    enabled_app.dependency_overrides[get_message] = lambda: "Goodbye World!"
+    assert func() == "Goodbye World!"
+    enabled_app.dependency_overrides.clear()
+    assert func() == "Hello World!"
+
+
+def test_codegen_falls_back_for_explicit_values(enabled_app: FastAPI):
+    def get_message() -> str:
+        return "Hello World!"
+
+    @inject(codegen=True)
+    def func(message: str = Depends(get_message)) -> str:
+        return message
+
+    assert func() == "Hello World!"
+    assert func(message="Goodbye World!") == "Goodbye World!"
+
+
+def test_codegen_unsupported_graphs(enabled_app: FastAPI):
+    def get_message() -> str:
+        return "Hello World!"
+
+    def memoized(
+        message: str = InjectDepends(get_message, memo=Memo()),
+    ) -> str:
+        return message
+
+    def lazy(
+        message: Lazy[str] = Depends(get_message),  # noqa: B008
+    ) -> str:
+        return message()
+
+    def plain(message: str = Depends(get_message)) -> str:
+        return message
+
+    for func, supported in ((memoized, False), (lazy, False), (plain, True)):
+        root = _get_plan(func).root(enabled_app)
+        assert (_GeneratedResolver(root).resolve is not None) is supported
+        assert inject(codegen=True)(func)() == "Hello World!"
@@ -0,0 +1,92 @@
+import time
+from collections.abc import Iterator
+
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import inject
+from fastapi_inject.concurrency import SiblingPool
+
+
+def test_concurrent_sibling_resolution(enabled_app: FastAPI):
+    calls = []
+
+    def get_shared() -> str:
+        calls.append("shared")
+        time.sleep(0.1)
+        return "shared"
+
+    def get_config(shared: str = Depends(get_shared)) -> str:
+        time.sleep(0.1)
+        return "config"
+
+    def get_flags(shared: str = Depends(get_shared)) -> str:
+        time.sleep(0.1)
+        return "flags"
+
+    def get_token() -> str:
+        time.sleep(0.1)
+        return "token"
+
+    @inject(concurrency=3)
+    def func(
+        config: str = Depends(get_config),
+        flags: str = Depends(get_flags),
+        token: str = Depends(get_token),
+    ) -> list[str]:
+        return [config, flags, token]
+
+    start = time.perf_counter()
+    assert func() == ["config", "flags", "token"]
+    assert time.perf_counter() - start < 0.3
+    assert calls == ["shared"]
+
+
+def test_concurrent_resolution_teardown_order(enabled_app: FastAPI):
+    events = []
+
+    def get_connection() -> Iterator[str]:
+        yield "connection"
+        events.append("close connection")
+
+    def get_session(connection: str = Depends(get_connection)) -> Iterator[str]:
+        yield "session"
+        events.append("close session")
+
+    def get_cache() -> Iterator[str]:
+        time.sleep(0.05)
+        yield "cache"
+        events.append("close cache")
+
+    @inject(concurrency=1)
+    def func(
+        session: str = Depends(get_session),
+        cache: str = Depends(get_cache),
+    ) -> list[str]:
+        return [session, cache]
+
+    assert func() == ["session", "cache"]
+    assert events.index("close session") < events.index("close connection")
+    assert sorted(events) == ["close cache", "close connection", "close session"]
+
+
+def test_concurrent_resolution_error(enabled_app: FastAPI):
+    def failing() -> str:
+        error_msg = "failed"
+        raise ValueError(error_msg)
+
+    def slow() -> str:
+        time.sleep(0.05)
+        return "slow"
+
+    @inject(concurrency=2)
+    def func(a: str = Depends(failing), b: str = Depends(slow)) -> str:
+        return a + b  # pragma: no cover
+
+    with pytest.raises(ValueError, match="failed"):
+        func()
+
+
+def test_sibling_pool_requires_a_worker():
+    with pytest.raises(ValueError, match="at least 1"):
+        SiblingPool(0)
@@ -0,0 +1,71 @@
+import subprocess
+import sys
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+from fastapi import Depends
+
+from fastapi_inject import Container, enable_injection, inject
+from fastapi_inject import Depends as InjectDepends
+from fastapi_inject._exceptions import NotEnabledError
+from fastapi_inject.enable import _disable_injection, _get_app_instance
+
+
+@pytest.fixture()
+def container() -> Iterator[Container]:
+    _disable_injection()
+    container = Container()
+    enable_injection(container)
+    yield container
+    _disable_injection()
+
+
+def get_message() -> str:
+    return "Hello World!"
+
+
+def test_container(container: Container):
+    @inject
+    def func(message: str = Depends(get_message)) -> str:
+        return message
+
+    assert _get_app_instance() is container
+    assert func() == "Hello World!"
+    container.dependency_overrides[get_message] = lambda: "Goodbye World!"
+    assert func() == "Goodbye World!"
+
+
+@pytest.mark.anyio()
+async def test_container_app_scope(container: Container):
+    events = []
+
+    async def get_pool() -> AsyncIterator[str]:
+        events.append("open")
+        yield "pool"
+        events.append("close")
+
+    @inject
+    async def func(pool: str = InjectDepends(get_pool, scope="app")) -> str:
+        return pool
+
+    async with container:
+        assert await func() == "pool"
+        assert await func() == "pool"
+        assert events == ["open"]
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_container_not_enabled():
+    with pytest.raises(NotEnabledError):
+        async with Container():
+            pass  # pragma: no cover
+
+
+def test_import_does_not_load_fastapi():
+    code = (
+        "import sys\n"
+        "from fastapi_inject import Container, Lazy, Memo, override\n"
+        "assert 'fastapi' not in sys.modules, 'fastapi was imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
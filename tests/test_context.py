@@ -0,0 +1,242 @@
+from collections.abc import AsyncIterator, Iterator
+from typing import Annotated
+
+import pytest
+from fastapi import BackgroundTasks, Depends, FastAPI, Request, Security
+from fastapi.responses import StreamingResponse
+from fastapi.security import SecurityScopes
+from httpx import AsyncClient
+
+from fastapi_inject import inject
+from fastapi_inject._exceptions import NoActiveRequestError
+
+
+@pytest.mark.anyio()
+async def test_inject_reuses_request_dependencies_async(
+    enabled_app: FastAPI,
+    client: AsyncClient,
+):
+    events = []
+
+    async def get_session() -> AsyncIterator[int]:
+        events.append("open")
+        yield len(events)
+        events.append("close")
+
+    @inject
+    async def get_user(session: int = Depends(get_session)) -> int:
+        return session
+
+    @inject
+    async def get_items(session: int = Depends(get_session)) -> int:
+        return session
+
+    @enabled_app.get("/sessions")
+    async def sessions_endpoint() -> dict[str, int]:
+        sessions = {"user": await get_user(), "items": await get_items()}
+        assert events == ["open"]
+        return sessions
+
+    response = await client.get("/sessions")
+    assert response.json() == {"user": 1, "items": 1}
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_inject_reuses_request_dependencies_sync(
+    enabled_app: FastAPI,
+    client: AsyncClient,
+):
+    events = []
+
+    def get_session() -> Iterator[int]:
+        events.append("open")
+        yield len(events)
+        events.append("close")
+
+    @inject
+    def get_user(session: int = Depends(get_session)) -> int:
+        return session
+
+    @enabled_app.get("/sessions")
+    def sessions_endpoint() -> list[int]:
+        sessions = [get_user(), get_user()]
+        assert events == ["open"]
+        return sessions
+
+    response = await client.get("/sessions")
+    assert response.json() == [1, 1]
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_inject_request_dependencies_keyed_by_arguments(
+    enabled_app: FastAPI,
+    client: AsyncClient,
+):
+    calls = []
+
+    def get_greeting(name: str) -> str:
+        calls.append(name)
+        return f"hello {name}"
+
+    def get_version() -> int:
+        calls.append("version")
+        return 1
+
+    @inject
+    def greet(
+        name: str,
+        greeting: str = Depends(get_greeting),
+        version: int = Depends(get_version),
+    ) -> str:
+        return f"{greeting} v{version}"
+
+    @inject
+    async def greet_async(
+        name: str,
+        greeting: str = Depends(get_greeting),
+        version: int = Depends(get_version),
+    ) -> str:
+        return f"{greeting} v{version}"
+
+    @enabled_app.get("/greetings")
+    async def greetings_endpoint() -> list[str]:
+        return [
+            await greet_async("carol"),
+            await greet_async("dave"),
+            await greet_async("carol"),
+        ]
+
+    @enabled_app.get("/greetings/sync")
+    def sync_greetings_endpoint() -> list[str]:
+        return [greet("alice"), greet("bob"), greet("alice")]
+
+    response = await client.get("/greetings")
+    assert response.json() == ["hello carol v1", "hello dave v1", "hello carol v1"]
+    assert sorted(calls) == ["carol", "dave", "version"]
+
+    calls.clear()
+    response = await client.get("/greetings/sync")
+    assert response.json() == ["hello alice v1", "hello bob v1", "hello alice v1"]
+    assert sorted(calls) == ["alice", "bob", "version"]
+
+
+@pytest.mark.anyio()
+async def test_inject_request_and_background_tasks(
+    enabled_app: FastAPI,
+    client: AsyncClient,
+):
+    events = []
+
+    def get_path(request: Request) -> str:
+        return request.url.path
+
+    @inject
+    async def record(
+        background_tasks: BackgroundTasks,
+        path: str = Depends(get_path),
+    ) -> str:
+        background_tasks.add_task(events.append, path)
+        return path
+
+    @enabled_app.get("/record")
+    async def record_endpoint() -> str:
+        return await record()
+
+    response = await client.get("/record")
+    assert response.json() == "/record"
+    assert events == ["/record"]
+
+
+@pytest.mark.anyio()
+async def test_inject_after_request_teardown(
+    enabled_app: FastAPI,
+    client: AsyncClient,
+):
+    events = []
+
+    def get_session() -> Iterator[str]:
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    async def get_async_session() -> AsyncIterator[str]:
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    @inject
+    def work(session: str = Depends(get_session)) -> str:
+        events.append("work")
+        return session
+
+    @inject
+    async def work_async(session: str = Depends(get_async_session)) -> str:
+        events.append("work")
+        return session
+
+    @enabled_app.get("/work/background")
+    async def background_endpoint(background_tasks: BackgroundTasks) -> str:
+        background_tasks.add_task(work)
+        background_tasks.add_task(work_async)
+        return work()
+
+    async def stream() -> AsyncIterator[str]:
+        yield work()
+        yield await work_async()
+
+    @enabled_app.get("/work/stream")
+    async def stream_endpoint() -> StreamingResponse:
+        return StreamingResponse(stream())
+
+    response = await client.get("/work/background")
+    assert response.json() == "session"
+    assert events == ["open", "work", "close"] * 3
+
+    events.clear()
+    response = await client.get("/work/stream")
+    assert response.text == "sessionsession"
+    assert events == ["open", "work", "close"] * 2
+
+
+def test_inject_request_outside_request(enabled_app: FastAPI):
+    @inject
+    def get_path(request: Request) -> str:
+        return request.url.path  # pragma: no cover
+
+    with pytest.raises(NoActiveRequestError):
+        get_path()
+
+
+@pytest.mark.anyio()
+async def test_inject_security_scopes(enabled_app: FastAPI):
+    calls = []
+
+    def get_scopes(security_scopes: SecurityScopes) -> list[str]:
+        calls.append(security_scopes.scope_str)
+        return security_scopes.scopes
+
+    def get_user(
+        scopes: Annotated[list[str], Security(get_scopes, scopes=["me"])],
+    ) -> str:
+        return " ".join(scopes)
+
+    def func(
+        user: Annotated[str, Security(get_user, scopes=["items"])],
+        admin: Annotated[list[str], Security(get_scopes, scopes=["admin"])],
+        scopes: Annotated[list[str], Depends(get_scopes)],
+    ) -> tuple[str, list[str], list[str]]:
+        return user, admin, scopes
+
+    async def async_func(
+        user: Annotated[str, Security(get_user, scopes=["items"])],
+        admin: Annotated[list[str], Security(get_scopes, scopes=["admin"])],
+        scopes: Annotated[list[str], Depends(get_scopes)],
+    ) -> tuple[str, list[str], list[str]]:
+        return user, admin, scopes
+
+    expected = ("items me", ["admin"], [])
+    assert inject(func)() == expected
+    assert await inject(async_func)() == expected
+    assert sorted(calls) == ["", "", "admin", "admin", "items me", "items me"]
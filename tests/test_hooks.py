@@ -0,0 +1,120 @@
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import (
+    InjectionHook,
+    MetricsCollector,
+    ResolutionEvent,
+    enable_injection,
+    inject,
+)
+
+
+class RecordingHook(InjectionHook):
+    def __init__(self) -> None:
+        self.resolved: list[ResolutionEvent] = []
+        self.torn_down: list[ResolutionEvent] = []
+
+    def on_resolve(self, event: ResolutionEvent) -> None:
+        self.resolved.append(event)
+
+    def on_teardown(self, event: ResolutionEvent) -> None:
+        self.torn_down.append(event)
+
+
+def get_number() -> int:
+    return 1
+
+
+def get_resource() -> Iterator[str]:
+    yield "resource"
+
+
+async def get_async_resource() -> AsyncIterator[str]:
+    yield "async resource"
+
+
+def test_sync_hooks(non_enabled_app: FastAPI):
+    hook = RecordingHook()
+    enable_injection(non_enabled_app, hooks=[hook])
+
+    @inject
+    def func(
+        a: int = Depends(get_number),
+        b: int = Depends(get_number),
+        c: str = Depends(get_resource),
+    ) -> str:
+        return f"{a} {b} {c}"
+
+    assert func() == "1 1 resource"
+    assert [(e.dependency, e.kind, e.cache_hit) for e in hook.resolved] == [
+        (get_number, "sync", False),
+        (get_number, "sync", True),
+        (get_resource, "sync_generator", False),
+        (func.__wrapped__, "sync", False),  # type: ignore[attr-defined]
+    ]
+    assert [(e.dependency, e.error) for e in hook.torn_down] == [
+        (get_resource, None),
+    ]
+
+
+@pytest.mark.anyio()
+async def test_async_hooks(non_enabled_app: FastAPI):
+    hook = RecordingHook()
+    enable_injection(non_enabled_app, hooks=[hook])
+
+    def failing() -> int:
+        error_msg = "failed"
+        raise ValueError(error_msg)
+
+    @inject
+    async def func(
+        a: int = Depends(get_number),
+        b: str = Depends(get_async_resource),
+    ) -> str:
+        return f"{a} {b}"
+
+    @inject
+    async def failing_func(a: int = Depends(failing)) -> int:
+        return a
+
+    assert await func() == "1 async resource"
+    kinds = {event.dependency: event.kind for event in hook.resolved}
+    assert kinds[get_number] == "threadpool"
+    assert kinds[get_async_resource] == "async_generator"
+    assert [event.dependency for event in hook.torn_down] == [get_async_resource]
+
+    with pytest.raises(ValueError, match="failed"):
+        await failing_func()
+    assert isinstance(hook.resolved[-1].error, ValueError)
+    assert hook.resolved[-1].dependency is failing
+
+
+def test_metrics_collector(non_enabled_app: FastAPI):
+    metrics = MetricsCollector(buckets=(1.0,))
+    enable_injection(non_enabled_app, hooks=[metrics])
+
+    @inject
+    def func(
+        a: int = Depends(get_number),
+        b: int = Depends(get_number),
+        c: str = Depends(get_resource),
+    ) -> str:
+        return f"{a} {b} {c}"
+
+    for _ in range(3):
+        func()
+
+    snapshot = metrics.snapshot()
+    number = snapshot[get_number.__qualname__]
+    assert number["calls"] == 3
+    assert number["cache_hits"] == 3
+    assert number["errors"] == 0
+    assert number["latency"]["count"] == 3
+    assert number["latency"]["buckets"] == {1.0: 3, float("inf"): 0}
+    assert snapshot[get_resource.__qualname__]["teardown_latency"]["count"] == 3
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
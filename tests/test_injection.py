@@ -1,15 +1,15 @@
-from typing import Any
+import threading
+from collections.abc import AsyncIterator, Iterator
+from typing import Annotated, Any
 
+import anyio
 import pytest
 from fastapi import Depends, FastAPI
 from httpx import AsyncClient
 
-from fastapi_inject.injection import (
-    _get_call_kwargs,
-    _get_sync_wrapper,
-    _sub_dependencies,
-    inject,
-)
+from fastapi_inject import Depends as InjectDepends
+from fastapi_inject.injection import _get_sync_wrapper, inject
+from fastapi_inject.plan import ParameterBinding, _sub_dependencies
 from tests.code.dependencies import (
     MESSAGE,
     async_function,
@@ -38,7 +38,7 @@ from tests.conftest import OVERRIDE_MESSAGE
         ((), {"a": 10}, {"a": 10, "b": "hello"}),
     ],
 )
-def test_get_call_kwargs(
+def test_parameter_binding(
     args: tuple,
     kwargs: dict[str, Any],
     expected_result: dict[str, Any],
@@ -46,7 +46,7 @@ def test_get_call_kwargs(
     def my_func(a: int, b: str = "hello") -> None:
         pass
 
-    assert _get_call_kwargs(my_func, *args, **kwargs) == expected_result
+    assert ParameterBinding(my_func).bind(args, kwargs) == expected_result
 
 
 def test_sub_dependencies(enabled_app: FastAPI):
@@ -133,3 +133,155 @@ async def test_inject_in_app_with_overrides(overrides_client: AsyncClient):
 
     response = await overrides_client.get("/async")
     assert response.json().get("message") == OVERRIDE_MESSAGE
+
+
+def test_inject_sync_use_cache(enabled_app: FastAPI):
+    calls = []
+
+    def get_session() -> int:
+        calls.append(1)
+        return len(calls)
+
+    def get_repository(session: int = Depends(get_session)) -> int:
+        return session
+
+    def get_sessions(
+        repository: int = Depends(get_repository),
+        session: int = Depends(get_session),
+        fresh_session: int = Depends(get_session, use_cache=False),
+    ) -> tuple[int, ...]:
+        return [repository, session, fresh_session]
+
+    assert inject(get_sessions)() == [1, 1, 2]
+    assert inject(get_sessions)() == [3, 3, 4]
+
+
+@pytest.mark.anyio()
+async def test_inject_async_use_cache(enabled_app: FastAPI):
+    calls = []
+
+    async def get_session() -> int:
+        calls.append(1)
+        session = len(calls)
+        await anyio.sleep(0.1)
+        return session
+
+    async def get_repository(session: int = Depends(get_session)) -> int:
+        return session
+
+    async def get_other_repository(session: int = Depends(get_session)) -> int:
+        return session
+
+    async def get_sessions(
+        repository: int = Depends(get_repository),
+        other_repository: int = Depends(get_other_repository),
+        fresh_session: int = Depends(get_session, use_cache=False),
+    ) -> tuple[int, ...]:
+        return [repository, other_repository, fresh_session]
+
+    repository, other_repository, fresh_session = await inject(get_sessions)()
+    assert repository == other_repository
+    assert fresh_session != repository
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio()
+async def test_inject_async_use_cache_shares_errors(enabled_app: FastAPI):
+    calls = []
+
+    async def get_session() -> int:
+        calls.append(1)
+        await anyio.sleep(0.1)
+        raise RuntimeError
+
+    async def get_repository(session: int = Depends(get_session)) -> int:
+        return session  # pragma: no cover
+
+    async def get_sessions(
+        repository: int = Depends(get_repository),
+        session: int = Depends(get_session),
+    ) -> tuple[int, ...]:
+        return [repository, session]  # pragma: no cover
+
+    with pytest.raises(RuntimeError):
+        await inject(get_sessions)()
+    assert len(calls) == 1
+
+
+def test_inject_sync_generator(enabled_app: FastAPI):
+    events = []
+
+    def get_cursor() -> Iterator[tuple[int, ...]]:
+        events.append("open")
+        yield (1, 2, 3)
+        events.append("close")
+
+    def stream_rows(cursor: tuple[int, ...] = Depends(get_cursor)) -> Iterator[int]:
+        yield from cursor
+
+    stream = inject(stream_rows)()
+    assert not events
+    assert next(stream) == 1
+    assert events == ["open"]
+    assert list(stream) == [2, 3]
+    assert events == ["open", "close"]
+
+    stream = inject(stream_rows)()
+    assert next(stream) == 1
+    stream.close()
+    assert events == ["open", "close", "open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_inject_async_generator(enabled_app: FastAPI):
+    events = []
+
+    async def get_cursor() -> AsyncIterator[tuple[int, ...]]:
+        events.append("open")
+        yield (1, 2, 3)
+        events.append("close")
+
+    async def stream_rows(
+        cursor: tuple[int, ...] = Depends(get_cursor),
+    ) -> AsyncIterator[int]:
+        for row in cursor:
+            yield row
+
+    stream = inject(stream_rows)()
+    assert await anext(stream) == 1
+    assert events == ["open"]
+    await stream.aclose()
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_inject_async_generator_in_streaming_response(client: AsyncClient):
+    response = await client.get("/stream")
+    assert response.text == MESSAGE * 2
+
+
+@pytest.mark.anyio()
+async def test_inject_async_inline_execution(enabled_app: FastAPI):
+    def get_thread() -> int:
+        return threading.get_ident()
+
+    async def get_threads(
+        inline_thread: int = InjectDepends(get_thread, execution="inline"),
+        pooled_thread: int = InjectDepends(get_thread, use_cache=False),
+    ) -> list[int]:
+        return [inline_thread, pooled_thread]
+
+    inline_thread, pooled_thread = await inject(get_threads)()
+    assert inline_thread == threading.get_ident()
+    assert pooled_thread != threading.get_ident()
+
+
+@pytest.mark.anyio()
+async def test_inject_annotated_dependencies(enabled_app: FastAPI):
+    async def get_messages(
+        message_1: Annotated[str, Depends(async_function)],
+        message_2: Annotated[str, Depends(sync_function)],
+    ) -> list[str]:
+        return [message_1, message_2]
+
+    assert await inject(get_messages)() == [MESSAGE, MESSAGE]
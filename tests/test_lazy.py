@@ -0,0 +1,66 @@
+from collections.abc import AsyncIterator, Iterator
+
+import anyio
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import AsyncLazy, Lazy, inject
+from fastapi_inject import Depends as InjectDepends
+
+
+def test_sync_lazy_dependency(enabled_app: FastAPI):
+    events = []
+
+    def get_session() -> Iterator[str]:
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    @inject
+    def func(
+        *,
+        use_session: bool,
+        session: Lazy[str] = Depends(get_session),  # noqa: B008
+    ) -> str | None:
+        if not use_session:
+            return None
+        assert session() is session()
+        return session()
+
+    assert func(use_session=False) is None
+    assert events == []
+    assert func(use_session=True) == "session"
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_async_lazy_dependency(enabled_app: FastAPI):
+    events = []
+
+    async def get_session() -> AsyncIterator[str]:
+        events.append("open")
+        await anyio.sleep(0.05)
+        yield "session"
+        events.append("close")
+
+    async def get_other() -> str:
+        return "other"
+
+    @inject
+    async def func(
+        *,
+        use_session: bool,
+        session: AsyncLazy[str] = InjectDepends(get_session, lazy=True),  # noqa: B008
+        other: str = Depends(get_other),
+    ) -> list[str]:
+        if not use_session:
+            return [other]
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(session.__call__)
+            tg.start_soon(session.__call__)
+        return [await session, other]
+
+    assert await func(use_session=False) == ["other"]
+    assert events == []
+    assert await func(use_session=True) == ["session", "other"]
+    assert events == ["open", "close"]
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections.abc import Iterator
+
+import anyio
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import Depends as InjectDepends
+from fastapi_inject import Memo, inject
+
+
+def test_sync_memo(enabled_app: FastAPI):
+    memo = Memo()
+    calls = []
+
+    def get_tenant(tenant_id: str) -> dict[str, str]:
+        calls.append(tenant_id)
+        return {"id": tenant_id}
+
+    def get_config(
+        tenant: dict[str, str] = InjectDepends(get_tenant, memo=memo),  # noqa: B008
+    ) -> str:
+        return tenant["id"]
+
+    @inject
+    def func(tenant_id: str, config: str = Depends(get_config)) -> str:
+        return config
+
+    assert func("a") == "a"
+    assert func("a") == "a"
+    assert func("b") == "b"
+    assert calls == ["a", "b"]
+
+    memo.invalidate(tenant_id="a")
+    assert func("a") == "a"
+    assert func("b") == "b"
+    assert calls == ["a", "b", "a"]
+
+
+def test_memo_ttl_and_maxsize(enabled_app: FastAPI):
+    memo = Memo(ttl=0.05, maxsize=2)
+    calls = []
+
+    def get_flag(name: str) -> str:
+        calls.append(name)
+        return name
+
+    @inject
+    def func(name: str, flag: str = InjectDepends(get_flag, memo=memo)) -> str:
+        return flag
+
+    for name in ("a", "b", "c", "a"):
+        func(name)
+    assert calls == ["a", "b", "c", "a"]
+    assert len(memo) == 2
+
+    time.sleep(0.06)
+    func("a")
+    assert calls == ["a", "b", "c", "a", "a"]
+
+
+def test_sync_memo_single_flight(enabled_app: FastAPI):
+    memo = Memo()
+    calls = []
+
+    def get_keys() -> str:
+        calls.append(1)
+        time.sleep(0.05)
+        return "keys"
+
+    @inject
+    def func(keys: str = InjectDepends(get_keys, memo=memo)) -> str:
+        return keys
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(func())) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["keys"] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio()
+async def test_async_memo_single_flight(enabled_app: FastAPI):
+    memo = Memo()
+    calls = []
+
+    async def get_keys() -> str:
+        calls.append(1)
+        await anyio.sleep(0.05)
+        return "keys"
+
+    @inject
+    async def func(keys: str = InjectDepends(get_keys, memo=memo)) -> str:
+        return keys
+
+    results = []
+
+    async def run() -> None:
+        results.append(await func())
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(run)
+    assert results == ["keys"] * 5
+    assert len(calls) == 1
+
+    memo.clear()
+    assert await func() == "keys"
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio()
+async def test_async_memo_errors_are_not_cached(enabled_app: FastAPI):
+    memo = Memo()
+    calls = []
+
+    async def get_keys() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError
+        return "keys"
+
+    @inject
+    async def func(keys: str = InjectDepends(get_keys, memo=memo)) -> str:
+        return keys
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        await func()
+    assert await func() == "keys"
+    assert await func() == "keys"
+    assert len(calls) == 2
+
+
+def test_memo_rejects_generators():
+    def get_session() -> Iterator[str]:
+        yield "session"
+
+    with pytest.raises(ValueError, match="cannot be memoized"):
+        InjectDepends(get_session, memo=Memo())
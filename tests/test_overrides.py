@@ -0,0 +1,76 @@
+import anyio
+import pytest
+from fastapi import FastAPI
+
+from fastapi_inject import inject, override
+from fastapi_inject.overrides import DependencyOverrides, _get_dependency_overrides
+from tests.code.dependencies import MESSAGE, async_function, sync_function
+from tests.code.functions import get_message, get_message_async
+from tests.conftest import OVERRIDE_MESSAGE
+
+
+def test_dependency_overrides_version():
+    overrides = DependencyOverrides()
+    assert overrides.version == 0
+    overrides[sync_function] = async_function
+    overrides.update({async_function: sync_function})
+    overrides.pop(sync_function)
+    del overrides[async_function]
+    overrides |= {sync_function: async_function}
+    overrides.clear()
+    assert overrides.version == 6
+    assert not overrides
+
+
+def test_get_dependency_overrides():
+    app = FastAPI()
+    app.dependency_overrides[sync_function] = async_function
+    overrides = _get_dependency_overrides(app)
+    assert isinstance(overrides, DependencyOverrides)
+    assert app.dependency_overrides is overrides
+    assert overrides == {sync_function: async_function}
+    assert _get_dependency_overrides(app) is overrides
+
+
+def test_override_layers(enabled_app: FastAPI):
+    def app_override() -> str:
+        return OVERRIDE_MESSAGE
+
+    def layer_override() -> str:
+        return "layer"
+
+    def nested_override() -> str:
+        return "nested"
+
+    enabled_app.dependency_overrides[sync_function] = app_override
+    injected = inject(get_message)
+    assert injected() == OVERRIDE_MESSAGE
+    with override({sync_function: layer_override}):
+        assert injected() == "layer"
+        with override({layer_override: nested_override}):
+            assert injected() == "layer"
+        with override({sync_function: nested_override}):
+            assert injected() == "nested"
+        assert injected() == "layer"
+    assert injected() == OVERRIDE_MESSAGE
+
+
+@pytest.mark.anyio()
+async def test_override_layers_are_task_local(enabled_app: FastAPI):
+    results = {}
+
+    async def run(name: str) -> None:
+        async def task_override() -> str:
+            await anyio.sleep(0.05)
+            return name
+
+        with override({async_function: task_override}):
+            await anyio.sleep(0.01)
+            results[name] = await inject(get_message_async)()
+
+    async with anyio.create_task_group() as tg:
+        for name in ("first", "second"):
+            tg.start_soon(run, name)
+
+    assert results == {"first": "first", "second": "second"}
+    assert await inject(get_message_async)() == MESSAGE
@@ -0,0 +1,76 @@
+from typing import Annotated
+
+from fastapi import Depends, FastAPI, Request, Security
+
+from fastapi_inject.context import _get_current_request
+from fastapi_inject.plan import ResolutionPlan, _get_plan
+from fastapi_inject.utils import CallKind
+from tests.code.dependencies import (
+    async_function,
+    async_generator,
+    sync_function,
+    sync_generator,
+)
+from tests.code.functions import get_messages_async, get_messages_sync
+
+
+def test_plan_compiles_graph(enabled_app: FastAPI):
+    root = ResolutionPlan(get_messages_async).root(enabled_app)
+    assert root.call is get_messages_async
+    assert root.kind is CallKind.ASYNC
+    assert [(edge.name, edge.node.call, edge.node.kind) for edge in root.edges] == [
+        ("message_1", sync_function, CallKind.SYNC),
+        ("message_2", async_function, CallKind.ASYNC),
+        ("message_3", sync_generator, CallKind.SYNC_GENERATOR),
+        ("message_4", async_generator, CallKind.ASYNC_GENERATOR),
+    ]
+
+
+def test_plan_is_cached(enabled_app: FastAPI):
+    plan = _get_plan(get_messages_sync)
+    assert _get_plan(get_messages_sync) is plan
+    assert plan.root(enabled_app) is plan.root(enabled_app)
+
+
+def test_plan_invalidated_on_override_change(enabled_app: FastAPI):
+    def sync_function_override() -> str:
+        return "override"  # pragma: no cover
+
+    plan = ResolutionPlan(get_messages_sync)
+    root = plan.root(enabled_app)
+
+    enabled_app.dependency_overrides[sync_function] = sync_function_override
+    overridden_root = plan.root(enabled_app)
+    assert overridden_root is not root
+    assert overridden_root.edges[0].node.call is sync_function_override
+
+    enabled_app.dependency_overrides = {}
+    assert plan.root(enabled_app).edges[0].node.call is sync_function
+
+
+def test_plan_shares_nodes():
+    def get_messages(
+        message_1: str = Depends(sync_function),
+        message_2: str = Depends(sync_function),
+    ) -> list[str]:
+        return [message_1, message_2]  # pragma: no cover
+
+    root = ResolutionPlan(get_messages).root(FastAPI())
+    assert root.edges[0].node is root.edges[1].node
+
+
+def test_plan_reads_annotated_dependencies(enabled_app: FastAPI):
+    def func(
+        message_1: Annotated[str, Depends(sync_function)],
+        message_2: Annotated[str, "metadata", Security(async_function)],
+        message_3: "Annotated[str, Depends(sync_generator, use_cache=False)]",
+        request: Annotated[Request, "metadata"],
+    ) -> None: ...  # pragma: no cover
+
+    root = ResolutionPlan(func).root(enabled_app)
+    assert [(edge.name, edge.node.call, edge.use_cache) for edge in root.edges] == [
+        ("message_1", sync_function, True),
+        ("message_2", async_function, True),
+        ("message_3", sync_generator, False),
+        ("request", _get_current_request, True),
+    ]
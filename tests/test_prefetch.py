@@ -0,0 +1,163 @@
+import time
+from collections.abc import AsyncIterator
+
+import anyio
+import anyio.lowlevel
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from httpx import AsyncClient
+
+from fastapi_inject import prefetch
+
+
+@pytest.mark.anyio()
+async def test_prefetch_overlaps_dependencies(enabled_app: FastAPI):
+    calls = []
+
+    async def get_user(user_id: int) -> str:
+        calls.append("user")
+        await anyio.sleep(0.1)
+        return f"user-{user_id}"
+
+    async def get_settings() -> str:
+        calls.append("settings")
+        await anyio.sleep(0.1)
+        return "settings"
+
+    async def func(
+        user_id: int,
+        page: int,
+        user: str = Depends(get_user),
+        settings: str = Depends(get_settings),
+    ) -> list[object]:
+        return [user, settings, page]
+
+    start = time.perf_counter()
+    async with prefetch(func, user_id=1) as handle:
+        await anyio.sleep(0.1)
+        assert await handle(page=2) == ["user-1", "settings", 2]
+    assert time.perf_counter() - start < 0.18
+    assert calls == ["user", "settings"]
+
+
+@pytest.mark.anyio()
+async def test_prefetch_waits_for_unknown_arguments(enabled_app: FastAPI):
+    calls = []
+
+    async def get_page(page: int) -> int:
+        calls.append(page)
+        return page
+
+    async def func(page: int, value: int = Depends(get_page)) -> int:
+        return value
+
+    async with prefetch(func) as handle:
+        await anyio.lowlevel.checkpoint()
+        assert calls == []
+        assert await handle(page=3) == 3
+    assert calls == [3]
+
+
+@pytest.mark.anyio()
+async def test_prefetch_skips_given_dependencies(enabled_app: FastAPI):
+    calls = []
+
+    async def get_session() -> str:
+        calls.append("session")
+        return "session"
+
+    async def func(session: str = Depends(get_session)) -> str:
+        return session
+
+    async with prefetch(func, session="given") as handle:
+        await anyio.sleep(0.01)
+        assert await handle() == "given"
+    assert not calls
+
+
+@pytest.mark.anyio()
+async def test_prefetch_teardown_and_cancellation(enabled_app: FastAPI):
+    events = []
+
+    async def get_session() -> AsyncIterator[str]:
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    async def get_slow() -> str:
+        await anyio.sleep(1)
+        return "slow"  # pragma: no cover
+
+    async def func(
+        session: str = Depends(get_session),
+        slow: str = Depends(get_slow),
+    ) -> str:
+        return session  # pragma: no cover
+
+    start = time.perf_counter()
+    async with prefetch(func):
+        await anyio.sleep(0.01)
+        assert events == ["open"]
+    assert events == ["open", "close"]
+    assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.anyio()
+async def test_prefetch_errors_raised_on_call(enabled_app: FastAPI):
+    async def get_broken() -> str:
+        raise ValueError
+
+    async def func(broken: str = Depends(get_broken)) -> str:
+        return broken  # pragma: no cover
+
+    async with prefetch(func) as handle:
+        await anyio.lowlevel.checkpoint()
+        with pytest.raises(ValueError):  # noqa: PT011
+            await handle()
+
+
+@pytest.mark.anyio()
+async def test_prefetch_errors_not_called_again(enabled_app: FastAPI):
+    calls = []
+
+    async def get_charge() -> str:
+        calls.append("charge")
+        raise ValueError
+
+    async def get_receipt(charge: str = Depends(get_charge)) -> str:
+        return charge  # pragma: no cover
+
+    async def func(
+        page: int,
+        charge: str = Depends(get_charge),
+        receipt: str = Depends(get_receipt),
+    ) -> str:
+        return charge  # pragma: no cover
+
+    async with prefetch(func) as handle:
+        await anyio.sleep(0.01)
+        with pytest.raises(ValueError):  # noqa: PT011
+            await handle(page=1)
+        with pytest.raises(ValueError):  # noqa: PT011
+            await handle(page=2)
+    assert calls == ["charge"]
+
+
+@pytest.mark.anyio()
+async def test_prefetch_block_errors_raised_as_is(
+    enabled_app: FastAPI,
+    client: AsyncClient,
+):
+    async def get_item(item_id: int) -> int:
+        return item_id
+
+    async def func(item_id: int, item: int = Depends(get_item)) -> int:
+        raise HTTPException(404)
+
+    @enabled_app.get("/items/{item_id}")
+    async def item_endpoint(item_id: int) -> int:
+        async with prefetch(func, item_id=item_id) as handle:
+            return await handle()
+
+    response = await client.get("/items/1")
+    assert response.status_code == 404
@@ -0,0 +1,38 @@
+import os
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+
+from fastapi_inject import Depends, enable_injection, inject
+from fastapi_inject.enable import _get_app_scope
+
+
+def get_checksum(data: bytes = b"payload") -> tuple[int, int]:
+    return os.getpid(), sum(data)
+
+
+@pytest.mark.anyio()
+async def test_process_execution(non_enabled_app: FastAPI):
+    enable_injection(non_enabled_app, process_workers=1)
+
+    @inject
+    async def func(
+        checksum: tuple[int, int] = Depends(get_checksum, execution="process"),
+    ) -> tuple[int, int]:
+        return checksum
+
+    async with non_enabled_app.router.lifespan_context(non_enabled_app):
+        pid, total = await func()
+        assert pid != os.getpid()
+        assert total == sum(b"payload")
+        assert _get_app_scope().process_pool is not None
+    assert _get_app_scope().process_pool is None
+
+
+def test_process_execution_rejects_generators():
+    def get_session() -> Iterator[str]:
+        yield "session"
+
+    with pytest.raises(ValueError, match="process pool"):
+        Depends(get_session, execution="process")
@@ -0,0 +1,151 @@
+from collections.abc import Awaitable, Callable
+
+import anyio
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import AsyncLazy, enable_injection, inject
+from fastapi_inject.plan import ResolutionPlan
+
+
+async def get_shared() -> str:
+    await anyio.sleep(0.1)
+    return "shared"
+
+
+async def get_slow(shared: str = Depends(get_shared)) -> str:
+    await anyio.sleep(0.1)
+    return "slow"
+
+
+async def get_fast(shared: str = Depends(get_shared)) -> str:
+    return "fast"
+
+
+async def get_leaf() -> str:
+    await anyio.sleep(0.2)
+    return "leaf"
+
+
+async def get_messages(
+    slow: str = Depends(get_slow),
+    fast: str = Depends(get_fast),
+    leaf: str = Depends(get_leaf),
+) -> list[str]:
+    return [slow, fast, leaf]
+
+
+def test_plan_marks_concurrent_nodes(enabled_app: FastAPI):
+    root = ResolutionPlan(get_messages).root(enabled_app)
+    assert root.concurrent
+    assert not ResolutionPlan(get_slow).root(enabled_app).concurrent
+
+
+@pytest.mark.anyio()
+async def test_scheduler_runs_in_critical_path_time(enabled_app: FastAPI):
+    with anyio.fail_after(0.29):
+        assert await inject(get_messages)() == ["slow", "fast", "leaf"]
+
+
+@pytest.mark.anyio()
+async def test_scheduler_concurrency_limit(non_enabled_app: FastAPI):
+    enable_injection(non_enabled_app, max_concurrency=2)
+    running = 0
+    max_running = 0
+
+    async def get_value() -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await anyio.sleep(0.05)
+        running -= 1
+        return 1
+
+    async def func(
+        a: int = Depends(get_value, use_cache=False),
+        b: int = Depends(get_value, use_cache=False),
+        c: int = Depends(get_value, use_cache=False),
+        d: int = Depends(get_value, use_cache=False),
+    ) -> int:
+        return a + b + c + d
+
+    assert await inject(func)() == 4
+    assert max_running == 2
+
+
+async def _run_concurrently(func: Callable[[], Awaitable[int]]) -> list[int]:
+    results = []
+
+    async def run() -> None:
+        results.append(await func())
+
+    with anyio.fail_after(1):
+        async with anyio.create_task_group() as tg:
+            for _ in range(5):
+                tg.start_soon(run)
+    return results
+
+
+async def get_limited_value() -> int:
+    await anyio.sleep(0.01)
+    return 1
+
+
+@pytest.mark.anyio()
+async def test_scheduler_concurrency_limit_nested_injection(
+    non_enabled_app: FastAPI,
+):
+    enable_injection(non_enabled_app, max_concurrency=1)
+
+    @inject
+    async def helper(value: int = Depends(get_limited_value)) -> int:
+        return value
+
+    async def get_nested() -> int:
+        return await helper()
+
+    @inject
+    async def func(nested: int = Depends(get_nested)) -> int:
+        return nested
+
+    assert await _run_concurrently(func) == [1] * 5
+
+
+@pytest.mark.anyio()
+async def test_scheduler_concurrency_limit_lazy_dependency(
+    non_enabled_app: FastAPI,
+):
+    enable_injection(non_enabled_app, max_concurrency=1)
+
+    async def get_lazy(
+        value: AsyncLazy[int] = Depends(get_limited_value),  # noqa: B008
+    ) -> int:
+        return await value
+
+    @inject
+    async def func(lazy: int = Depends(get_lazy)) -> int:
+        return lazy
+
+    assert await _run_concurrently(func) == [1] * 5
+
+
+@pytest.mark.anyio()
+async def test_scheduler_raises_dependency_error(enabled_app: FastAPI):
+    async def failing() -> str:
+        error_msg = "failed"
+        raise ValueError(error_msg)
+
+    async def first(value: str = Depends(failing)) -> str:
+        return value  # pragma: no cover
+
+    async def second(value: str = Depends(failing)) -> str:
+        return value  # pragma: no cover
+
+    async def func(
+        a: str = Depends(first),
+        b: str = Depends(second),
+    ) -> str:
+        return a + b  # pragma: no cover
+
+    with pytest.raises(ValueError, match="failed"):
+        await inject(func)()
@@ -0,0 +1,84 @@
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from fastapi_inject import Depends, inject
+from fastapi_inject.enable import _get_app_scope
+from fastapi_inject.scopes import AppScopedDependency
+
+
+def test_app_scoped_depends():
+    def get_pool() -> object:
+        return object()  # pragma: no cover
+
+    depends = Depends(get_pool, scope="app")
+    assert isinstance(depends.dependency, AppScopedDependency)
+    assert depends.dependency.dependency is get_pool
+    assert depends.scope == "app"
+    assert Depends(get_pool).dependency is get_pool
+
+
+@pytest.mark.anyio()
+async def test_app_scoped_sync(enabled_app: FastAPI):
+    events = []
+
+    def get_pool() -> Iterator[object]:
+        events.append("open")
+        yield object()
+        events.append("close")
+
+    def get_connection(pool: object = Depends(get_pool, scope="app")) -> object:
+        return pool
+
+    async with enabled_app.router.lifespan_context(enabled_app):
+        assert inject(get_connection)() is inject(get_connection)()
+        assert events == ["open"]
+    assert events == ["open", "close"]
+    assert not _get_app_scope().values
+
+
+@pytest.mark.anyio()
+async def test_app_scoped_async(enabled_app: FastAPI):
+    events = []
+
+    async def get_pool() -> AsyncIterator[object]:
+        events.append("open")
+        yield object()
+        events.append("close")
+
+    async def get_connection(pool: object = Depends(get_pool, scope="app")) -> object:
+        return pool
+
+    async def get_connections(
+        connection_1: object = Depends(get_connection, use_cache=False),
+        connection_2: object = Depends(get_connection, use_cache=False),
+    ) -> list[object]:
+        return [connection_1, connection_2]
+
+    async with enabled_app.router.lifespan_context(enabled_app):
+        connection_1, connection_2 = await inject(get_connections)()
+        assert connection_1 is connection_2
+        assert await inject(get_connection)() is connection_1
+        assert events == ["open"]
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_app_scoped_shared_with_endpoint(enabled_app: FastAPI):
+    def get_pool() -> object:
+        return object()
+
+    pool_depends = Depends(get_pool, scope="app")
+
+    async def get_injected_pool(pool: object = pool_depends) -> object:
+        return pool
+
+    @enabled_app.get("/pool")
+    async def pool_endpoint(pool: object = pool_depends) -> dict[str, bool]:
+        return {"shared": pool is await inject(get_injected_pool)()}
+
+    async with AsyncClient(app=enabled_app, base_url="http://test") as client:
+        response = await client.get("/pool")
+    assert response.json() == {"shared": True}
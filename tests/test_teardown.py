@@ -0,0 +1,223 @@
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException
+
+from fastapi_inject import inject
+from fastapi_inject.teardown import AsyncTeardownStack
+
+
+@pytest.mark.anyio()
+async def test_async_teardown_stack_unwinds_layers_in_order():
+    events = []
+
+    @asynccontextmanager
+    async def context(name: str) -> AsyncIterator[str]:
+        yield name
+        await anyio.sleep(0.1)
+        events.append(name)
+
+    start = time.monotonic()
+    async with AsyncTeardownStack() as stack:
+        await stack.layer(0).enter_async_context(context("leaf_1"))
+        await stack.layer(0).enter_async_context(context("leaf_2"))
+        await stack.layer(1).enter_async_context(context("parent"))
+    assert events[0] == "parent"
+    assert sorted(events[1:]) == ["leaf_1", "leaf_2"]
+    assert time.monotonic() - start < 0.3
+
+
+@pytest.mark.anyio()
+async def test_async_teardown_stack_pop_all():
+    events = []
+
+    @asynccontextmanager
+    async def context() -> AsyncIterator[None]:
+        yield
+        events.append("closed")
+
+    async with AsyncTeardownStack() as stack:
+        await stack.layer(0).enter_async_context(context())
+        popped_stack = stack.pop_all()
+    assert not events
+    await popped_stack.aclose()
+    assert events == ["closed"]
+
+
+@pytest.mark.anyio()
+async def test_async_teardown_stack_suppresses_errors():
+    events = []
+
+    @asynccontextmanager
+    async def suppressing() -> AsyncIterator[None]:
+        try:
+            yield
+        except ValueError:
+            events.append("suppressed")
+
+    @asynccontextmanager
+    async def context() -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            events.append("closed")
+
+    async with AsyncTeardownStack() as stack:
+        await stack.layer(0).enter_async_context(suppressing())
+        await stack.layer(0).enter_async_context(context())
+        raise ValueError
+    assert sorted(events) == ["closed", "suppressed"]
+
+
+@pytest.mark.anyio()
+async def test_inject_async_teardown_maps_errors(enabled_app: FastAPI):
+    events = []
+
+    async def get_session() -> AsyncIterator[str]:
+        try:
+            yield "session"
+        except ValueError:
+            raise HTTPException(400) from None
+
+    async def get_cache() -> AsyncIterator[str]:
+        try:
+            yield "cache"
+        finally:
+            events.append("closed")
+
+    @inject
+    async def func(
+        session: str = Depends(get_session),
+        cache: str = Depends(get_cache),
+    ) -> str:
+        raise ValueError
+
+    with pytest.raises(HTTPException) as exc_info:
+        await func()
+    assert exc_info.value.status_code == 400
+    assert events == ["closed"]
+
+
+def test_inject_sync_teardown(enabled_app: FastAPI):
+    events = []
+
+    def get_session() -> Iterator[str]:
+        yield "session"
+        events.append("closed")
+
+    def use_session(session: str = Depends(get_session)) -> str:
+        assert not events
+        return session
+
+    assert inject(use_session)() == "session"
+    assert events == ["closed"]
+
+
+@pytest.mark.anyio()
+async def test_inject_async_teardown(enabled_app: FastAPI):
+    events = []
+
+    async def get_session() -> AsyncIterator[str]:
+        try:
+            yield "session"
+        except ValueError:
+            events.append("error")
+            raise
+        events.append("closed")
+
+    async def use_session(session: str = Depends(get_session)) -> str:
+        return session
+
+    async def fail(session: str = Depends(get_session)) -> str:
+        raise ValueError
+
+    assert await inject(use_session)() == "session"
+    assert events == ["closed"]
+    with pytest.raises(ValueError):  # noqa: PT011
+        await inject(fail)()
+    assert events == ["closed", "error"]
+
+
+def test_inject_sync_deferred_teardown(enabled_app: FastAPI):
+    events = []
+
+    def get_session() -> Iterator[str]:
+        yield "session"
+        events.append("closed")
+
+    @inject(defer_teardown=True)
+    def use_session(
+        background_tasks: BackgroundTasks,
+        session: str = Depends(get_session),
+    ) -> str:
+        return session
+
+    background_tasks = BackgroundTasks()
+    assert use_session(background_tasks) == "session"
+    assert not events
+    assert len(background_tasks.tasks) == 1
+
+
+def test_inject_sync_deferred_teardown_in_thread(enabled_app: FastAPI):
+    closed = threading.Event()
+
+    def get_session() -> Iterator[str]:
+        yield "session"
+        closed.set()
+
+    @inject(defer_teardown=True)
+    def use_session(session: str = Depends(get_session)) -> str:
+        return session
+
+    assert use_session() == "session"
+    assert closed.wait(1)
+
+
+@pytest.mark.anyio()
+async def test_inject_async_deferred_teardown(enabled_app: FastAPI):
+    closed = anyio.Event()
+
+    async def get_session() -> AsyncIterator[str]:
+        yield "session"
+        closed.set()
+
+    @inject(defer_teardown=True)
+    async def use_session(session: str = Depends(get_session)) -> str:
+        return session
+
+    assert await use_session() == "session"
+    assert not closed.is_set()
+    with anyio.fail_after(1):
+        await closed.wait()
+
+
+@pytest.mark.anyio()
+async def test_inject_async_deferred_teardown_errors_logged(
+    enabled_app: FastAPI,
+    caplog: pytest.LogCaptureFixture,
+):
+    closed = anyio.Event()
+
+    async def get_session() -> AsyncIterator[str]:
+        try:
+            yield "session"
+        finally:
+            closed.set()
+            raise ValueError
+
+    @inject(defer_teardown=True)
+    async def use_session(session: str = Depends(get_session)) -> str:
+        return session
+
+    assert await use_session() == "session"
+    with anyio.fail_after(1):
+        await closed.wait()
+    await anyio.sleep(0.01)
+    (record,) = caplog.records
+    assert record.message == "Deferred teardown failed"
+    assert record.exc_info is not None
+    assert isinstance(record.exc_info[1], ValueError)
@@ -0,0 +1,170 @@
+import time
+from collections.abc import AsyncIterator, Iterator
+
+import anyio
+import anyio.lowlevel
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import AsyncLazy, inject
+from fastapi_inject import Depends as InjectDepends
+
+
+async def get_slow() -> str:
+    await anyio.sleep(1)
+    return "slow"
+
+
+@pytest.mark.anyio()
+async def test_dependency_timeout(enabled_app: FastAPI):
+    @inject
+    async def func(
+        value: str = InjectDepends(get_slow, timeout=0.01),
+    ) -> str:
+        return value
+
+    with pytest.raises(TimeoutError):
+        await func()
+
+
+@pytest.mark.anyio()
+async def test_dependency_timeout_fallback(enabled_app: FastAPI):
+    async def get_fast() -> str:
+        return "fast"
+
+    async def get_leaf() -> str:
+        await anyio.sleep(1)
+        return "leaf"  # pragma: no cover
+
+    async def get_parent(leaf: str = Depends(get_leaf)) -> str:
+        return leaf  # pragma: no cover
+
+    @inject
+    async def func(
+        value: str = InjectDepends(get_slow, timeout=0.01, fallback="fallback"),
+        parent: str = InjectDepends(get_parent, timeout=0.1, fallback="fallback"),
+        other: str = Depends(get_fast),
+    ) -> list[str]:
+        return [value, parent, other]
+
+    # The slow sub-dependency is cancelled with the dependency that timed out
+    start = time.perf_counter()
+    assert await func() == ["fallback", "fallback", "fast"]
+    assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.anyio()
+async def test_dependency_timeout_shared_sub_dependency(enabled_app: FastAPI):
+    calls = []
+
+    async def get_shared() -> str:
+        calls.append(1)
+        await anyio.sleep(0.2)
+        return "shared"
+
+    async def get_parent(shared: str = Depends(get_shared)) -> str:
+        return shared  # pragma: no cover
+
+    async def get_other(
+        shared: AsyncLazy[str] = Depends(get_shared),  # noqa: B008
+    ) -> str:
+        await anyio.sleep(0.05)
+        return await shared
+
+    @inject
+    async def func(
+        parent: str = InjectDepends(get_parent, timeout=0.1, fallback="fallback"),
+        other: str = Depends(get_other),
+    ) -> list[str]:
+        return [parent, other]
+
+    # Waiting on a resolution that timed out elsewhere starts it again
+    assert await func() == ["fallback", "shared"]
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio()
+async def test_dependency_timeout_fallback_factory(enabled_app: FastAPI):
+    @inject
+    async def func(
+        value: list[str] = InjectDepends(  # noqa: B008
+            get_slow,
+            timeout=0.01,
+            fallback_factory=list,
+        ),
+    ) -> list[str]:
+        return value
+
+    first = await func()
+    assert first == []
+    assert await func() is not first
+
+
+def test_fallback_requires_timeout():
+    with pytest.raises(ValueError, match="requires a timeout"):
+        InjectDepends(get_slow, fallback=None)
+    with pytest.raises(ValueError, match="both fallback and fallback_factory"):
+        InjectDepends(get_slow, timeout=1, fallback=None, fallback_factory=list)
+
+
+@pytest.mark.anyio()
+async def test_deadline_cancels_siblings_and_tears_down(enabled_app: FastAPI):
+    events = []
+
+    async def get_session() -> AsyncIterator[str]:
+        events.append("open")
+        try:
+            yield "session"
+        finally:
+            # Teardown can still await, as it runs outside the deadline
+            await anyio.lowlevel.checkpoint()
+            events.append("close")
+
+    async def get_first(session: str = Depends(get_session)) -> str:
+        await anyio.sleep(1)
+        return session
+
+    async def get_second(session: str = Depends(get_session)) -> str:
+        await anyio.sleep(1)
+        return session
+
+    @inject(deadline=0.05)
+    async def func(
+        first: str = Depends(get_first),
+        second: str = Depends(get_second),
+    ) -> list[str]:
+        return [first, second]
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        await func()
+    assert time.perf_counter() - start < 0.5
+    assert events == ["open", "close"]
+
+
+@pytest.mark.anyio()
+async def test_deadline_covers_function_body(enabled_app: FastAPI):
+    @inject(deadline=0.01)
+    async def func() -> None:
+        await anyio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        await func()
+
+
+def test_inject_rejects_unsupported_options(enabled_app: FastAPI):
+    def func() -> None:
+        pass  # pragma: no cover
+
+    async def async_func() -> None:
+        pass  # pragma: no cover
+
+    def stream() -> Iterator[None]:
+        yield  # pragma: no cover
+
+    with pytest.raises(ValueError, match="deadline can't be used with sync"):
+        inject(func, deadline=0.001)
+    with pytest.raises(ValueError, match="concurrency, codegen can't be used"):
+        inject(async_func, concurrency=2, codegen=True)
+    with pytest.raises(ValueError, match="sync generator functions"):
+        inject(deadline=0.001)(stream)
@@ -1,10 +1,16 @@
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AsyncExitStack, ExitStack
 
+import anyio
 import pytest
 
 from fastapi_inject.utils import (
+    CallKind,
     _call_dependency_async,
     _call_dependency_sync,
+    _get_call_kind,
     _is_async_dependency,
     _solve_async_generator_async_context,
     _solve_sync_generator_async_context,
@@ -99,3 +105,38 @@ async def test_call_dependency_async():
         assert await _call_dependency_async(sync_generator, stack) == MESSAGE
         assert await _call_dependency_async(async_function, stack) == MESSAGE
         assert await _call_dependency_async(async_generator, stack) == MESSAGE
+
+
+def test_get_call_kind():
+    assert _get_call_kind(sync_function) is CallKind.SYNC
+    assert _get_call_kind(sync_generator) is CallKind.SYNC_GENERATOR
+    assert _get_call_kind(async_function) is CallKind.ASYNC
+    assert _get_call_kind(async_generator) is CallKind.ASYNC_GENERATOR
+
+
+@pytest.mark.anyio()
+async def test_call_dependency_async_execution():
+    loop_thread = threading.get_ident()
+
+    def get_thread() -> int:
+        return threading.get_ident()
+
+    def get_thread_generator() -> Iterator[int]:
+        yield threading.get_ident()
+
+    limiter = anyio.CapacityLimiter(1)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        async with AsyncExitStack() as stack:
+            for dependency in (get_thread, get_thread_generator):
+                assert (
+                    await _call_dependency_async(dependency, stack, execution="inline")
+                    == loop_thread
+                )
+                assert (
+                    await _call_dependency_async(dependency, stack, execution=limiter)
+                    != loop_thread
+                )
+                assert (
+                    await _call_dependency_async(dependency, stack, execution=executor)
+                    != loop_thread
+                )
@@ -0,0 +1,123 @@
+from collections.abc import Iterator
+from weakref import WeakKeyDictionary
+
+import pytest
+from fastapi import Depends, FastAPI
+
+from fastapi_inject import Depends as InjectDepends
+from fastapi_inject import enable_injection, inject
+from fastapi_inject._exceptions import DependencyCycleError, InjectionValidationError
+from fastapi_inject.plan import ResolutionPlan
+from fastapi_inject.validation import _validate_injected
+from tests.code.dependencies import async_function
+
+
+@pytest.fixture()
+def registry(monkeypatch: pytest.MonkeyPatch) -> WeakKeyDictionary:
+    registry = WeakKeyDictionary()
+    monkeypatch.setattr("fastapi_inject.validation._injected", registry)
+    return registry
+
+
+def get_first() -> str:
+    return "first"  # pragma: no cover
+
+
+def get_second(first: str = Depends(get_first)) -> str:
+    return first  # pragma: no cover
+
+
+def get_cyclic(second: str = Depends(get_second)) -> str:
+    return second  # pragma: no cover
+
+
+def test_compile_detects_cycles(enabled_app: FastAPI):
+    enabled_app.dependency_overrides[get_first] = get_cyclic
+    with pytest.raises(DependencyCycleError) as exc_info:
+        ResolutionPlan(get_second).root(enabled_app)
+    assert exc_info.value.cycle == [
+        get_second.__qualname__,
+        get_cyclic.__qualname__,
+        get_second.__qualname__,
+    ]
+
+
+def test_validate_injected(enabled_app: FastAPI, registry: WeakKeyDictionary):
+    enabled_app.dependency_overrides[get_first] = get_cyclic
+
+    def missing(message: str = Depends()) -> str:
+        return message  # pragma: no cover
+
+    def async_in_sync(message: str = Depends(async_function)) -> str:
+        return message  # pragma: no cover
+
+    def bridged(message: str = Depends(async_function)) -> str:
+        return message  # pragma: no cover
+
+    functions = [
+        inject(get_second),
+        inject(missing),
+        inject(async_in_sync),
+        inject(bridged, bridge_async=True),
+    ]
+
+    with pytest.raises(InjectionValidationError) as exc_info:
+        _validate_injected(enabled_app)
+    errors = exc_info.value.errors
+    assert len(errors) == 3
+    assert errors[0].startswith(f"{get_second.__qualname__}: Dependency cycle")
+    assert errors[1].startswith(f"{missing.__qualname__}: Depends instance")
+    assert errors[2] == (
+        f"{async_in_sync.__qualname__}: cannot inject async dependency "
+        f"{async_function.__qualname__} into sync function"
+    )
+    assert len(functions) == 4
+
+
+@pytest.mark.anyio()
+async def test_warm_up_resolves_app_scoped_dependencies(
+    non_enabled_app: FastAPI,
+    registry: WeakKeyDictionary,
+):
+    calls = []
+
+    async def get_pool() -> str:
+        calls.append("pool")
+        return "pool"
+
+    @inject
+    async def func(pool: str = InjectDepends(get_pool, scope="app")) -> str:
+        return pool
+
+    enable_injection(non_enabled_app, warm=True)
+    async with non_enabled_app.router.lifespan_context(non_enabled_app):
+        assert calls == ["pool"]
+        assert await func() == "pool"
+    assert calls == ["pool"]
+
+
+@pytest.mark.anyio()
+async def test_warm_up_resolves_sub_dependencies_once(
+    non_enabled_app: FastAPI,
+    registry: WeakKeyDictionary,
+):
+    events = []
+
+    def get_settings() -> Iterator[str]:
+        events.append("settings")
+        yield "settings"
+        events.append("close settings")
+
+    def get_client(settings: str = Depends(get_settings)) -> str:
+        events.append("client")
+        return "client"
+
+    @inject
+    async def func(client: str = InjectDepends(get_client, scope="app")) -> str:
+        return client
+
+    enable_injection(non_enabled_app, warm=True)
+    async with non_enabled_app.router.lifespan_context(non_enabled_app):
+        assert events == ["settings", "client"]
+        assert await func() == "client"
+    assert events == ["settings", "client", "close settings"]